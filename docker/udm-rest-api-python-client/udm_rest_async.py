@@ -0,0 +1,285 @@
+# SPDX-License-Identifier: AGPL-3.0-only
+# SPDX-FileCopyrightText: 2026 Univention GmbH
+"""
+Asynchronous client for the UDM REST API with a keep-alive connection pool.
+
+`univention.admin.rest.client.UDM` sends one request at a time and follows
+the hypermedia links of every resource. This client builds the resource
+URLs of the UDM REST API directly, keeps the connections of an aiohttp
+session alive and runs up to `concurrency` requests in parallel.
+Objects are returned as the JSON documents of the API, e.g.
+`obj["properties"]["username"]`.
+
+    async with UDM.http("http://localhost:9979/udm/", "cn=admin", password, concurrency=16) as udm:
+        async for obj in udm.search("users/user", "(uid=a*)"):
+            ...
+        results = await udm.delete_many("blocklists/entry", dns)
+        progress = await udm.bulk_delete("users/user", "(description=temporary)")
+
+Idempotent requests are repeated on connection errors, timeouts and on
+HTTP 429, 502, 503 and 504, waiting `Retry-After` or an exponential
+backoff between the attempts. Other requests, e.g. the POST of
+`create()` and the PATCH of `modify()` with an ETag, are only repeated
+when the server did not receive or reject them unprocessed: when the
+connection could not be established or on HTTP 429. They can opt in to
+all retries with `retry=True`.
+"""
+
+import asyncio
+import base64
+import email.utils
+import json
+import logging
+import time
+import urllib.parse
+from typing import Any, AsyncIterator, Dict, Iterable, List, Mapping, NamedTuple, Optional, Tuple
+
+import aiohttp
+
+log = logging.getLogger(__name__)
+
+RETRY_STATUS = frozenset({429, 502, 503, 504})
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+
+
+class HTTPError(Exception):
+
+    def __init__(self, code: int, message: str, body: Any = None):
+        super().__init__(f"{code}: {message}")
+        self.code = code
+        self.body = body
+
+
+class NotFound(HTTPError):
+    pass
+
+
+class UnprocessableEntity(HTTPError):
+    pass
+
+
+class Result(NamedTuple):
+    """Outcome of one operation of a bulk helper."""
+
+    dn: str
+    value: Any = None
+    error: Optional[BaseException] = None
+
+
+def _error(code: int, message: str, body: Any) -> HTTPError:
+    cls = {404: NotFound, 422: UnprocessableEntity}.get(code, HTTPError)
+    return cls(code, message, body)
+
+
+def _retry_after(value: Optional[str], default: float) -> float:
+    """Return the delay of a `Retry-After` header in seconds or as HTTP date, `default` if it is invalid."""
+    if not value:
+        return default
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, email.utils.parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return default
+
+
+def _message(body: Any) -> Optional[str]:
+    """Return the error message of the resources, `{"error": {"message": ...}}`, or of bulk delete."""
+    error = body.get("error") if isinstance(body, dict) else None
+    return error.get("message") if isinstance(error, dict) else error
+
+
+async def _read_json(response: aiohttp.ClientResponse) -> Any:
+    text = await response.text()
+    if not text:
+        return None
+    try:
+        return json.loads(text)
+    except ValueError:
+        return text
+
+
+class UDM:
+
+    def __init__(
+        self, uri: str, username: str, password: str, concurrency: int = 8, retries: int = 3,
+        backoff: float = 0.5, timeout: float = 300, page_size: int = 500,
+    ):
+        self.uri = uri.rstrip("/") + "/"
+        credentials = base64.b64encode(f"{username}:{password}".encode("utf-8")).decode("ascii")
+        self.headers = {"Accept": "application/json", "Authorization": f"Basic {credentials}"}
+        self.concurrency = concurrency
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = aiohttp.ClientTimeout(total=timeout)
+        self.page_size = page_size
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    @classmethod
+    def http(cls, uri: str, username: str, password: str, **kwargs) -> "UDM":
+        return cls(uri, username, password, **kwargs)
+
+    async def __aenter__(self) -> "UDM":
+        self._session = aiohttp.ClientSession(
+            timeout=self.timeout,
+            connector=aiohttp.TCPConnector(limit=self.concurrency),
+            headers=self.headers,
+        )
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    def module_uri(self, module: str) -> str:
+        return f"{self.uri}{module.strip('/')}/"
+
+    def object_uri(self, module: str, dn: str) -> str:
+        return self.module_uri(module) + urllib.parse.quote(dn, safe="")
+
+    async def request(
+        self, method: str, uri: str, retry: Optional[bool] = None, **kwargs,
+    ) -> Tuple[int, Mapping[str, str], Any]:
+        """
+        Send a request with retries, return status, headers and the decoded JSON body.
+
+        `retry` defaults to whether `method` is idempotent, see the module documentation.
+        """
+        if self._session is None:
+            raise RuntimeError("use 'async with UDM.http(...)'")
+        if retry is None:
+            retry = method.upper() in IDEMPOTENT_METHODS
+        for attempt in range(self.retries + 1):
+            delay = self.backoff * 2 ** attempt
+            try:
+                async with self._semaphore, self._session.request(method, uri, **kwargs) as response:
+                    body = await _read_json(response)
+                    if response.status < 400:
+                        return response.status, response.headers.copy(), body
+                    retryable = response.status in RETRY_STATUS if retry else response.status == 429
+                    if not retryable or attempt == self.retries:
+                        raise _error(response.status, _message(body) or response.reason or "", body)
+                    delay = _retry_after(response.headers.get("Retry-After"), delay)
+                    log.debug("%s %s: HTTP %d, retrying in %.1f seconds", method, uri, response.status, delay)
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as exc:
+                if not (retry or isinstance(exc, aiohttp.ClientConnectorError)) or attempt == self.retries:
+                    raise
+                log.debug("%s %s: %s, retrying in %.1f seconds", method, uri, exc, delay)
+            await asyncio.sleep(delay)
+        raise AssertionError("unreachable")
+
+    async def get_ldap_base(self) -> str:
+        _status, _headers, body = await self.request("GET", f"{self.uri}ldap/base/")
+        return body["dn"]
+
+    async def get(self, module: str, dn: str) -> Dict[str, Any]:
+        _status, headers, body = await self.request("GET", self.object_uri(module, dn))
+        body["etag"] = headers.get("ETag")
+        return body
+
+    async def search(
+        self, module: str, filter: Optional[str] = None, position: Optional[str] = None, scope: str = "sub",
+        properties: Optional[Iterable[str]] = None, page_size: Optional[int] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Yield the objects found, requesting the next page only when the current one is consumed."""
+        params: List[Tuple[str, str]] = [("scope", scope), ("limit", str(page_size or self.page_size))]
+        if filter:
+            params.append(("filter", filter))
+        if position:
+            params.append(("position", position))
+        for name in properties or ():
+            params.append(("properties", name))
+        page = 1
+        while True:
+            _status, _headers, body = await self.request(
+                "GET", self.module_uri(module), params=params + [("page", str(page))],
+            )
+            objects = body.get("_embedded", {}).get("udm:object", [])
+            for obj in objects:
+                yield obj
+            if not body.get("_links", {}).get("next") or not objects:
+                return
+            page += 1
+
+    async def create(self, module: str, position: str, properties: Dict[str, Any], retry: bool = False) -> str:
+        """Create an object and return its DN, `retry` repeats the request also after a timeout."""
+        _status, headers, body = await self.request(
+            "POST", self.module_uri(module), json={"position": position, "properties": properties}, retry=retry,
+        )
+        return (body or {}).get("dn") or urllib.parse.unquote(headers["Location"].rstrip("/").rsplit("/", 1)[1])
+
+    async def modify(self, module: str, dn: str, properties: Dict[str, Any], etag: Optional[str] = None) -> None:
+        headers = {"If-Match": etag} if etag else {}
+        # The properties are set to the given values, repeating the request does not change the result.
+        # With If-Match it does: a repetition of an applied change fails with 412 against the new ETag.
+        await self.request(
+            "PATCH", self.object_uri(module, dn), json={"properties": properties}, headers=headers, retry=not etag,
+        )
+
+    async def delete(self, module: str, dn: str, missing_ok: bool = False) -> None:
+        try:
+            await self.request("DELETE", self.object_uri(module, dn))
+        except NotFound:
+            if not missing_ok:
+                raise
+
+    async def bulk_delete(
+        self, module: str, filter: str, position: Optional[str] = None, scope: str = "sub",
+        rate: Optional[float] = None, dry_run: bool = False, poll_interval: float = 2, max_not_found: int = 30,
+    ) -> Dict[str, Any]:
+        """
+        Remove all objects matching `filter` in a job of the server, return its final progress.
+
+        The job only exists in the pod which started it. With more than one replica, polls
+        reaching another pod are answered with 404 and are repeated. After `max_not_found`
+        of them in a row, the last known progress is returned with the status "unknown".
+        """
+        data: Dict[str, Any] = {"filter": filter, "scope": scope, "dryRun": dry_run}
+        if position:
+            data["position"] = position
+        if rate:
+            data["rate"] = rate
+        _status, headers, job = await self.request("POST", f"{self.module_uri(module)}bulk-delete", json=data)
+        location = urllib.parse.urljoin(self.uri, headers["Location"])
+        not_found = 0
+        while job["status"] in ("pending", "running"):
+            await asyncio.sleep(poll_interval)
+            try:
+                _status, _headers, job = await self.request("GET", location)
+            except NotFound:
+                not_found += 1
+                if not_found >= max_not_found:
+                    log.warning("Bulk delete job %s was not found in %d polls, it runs in another pod",
+                                job["id"], not_found)
+                    return dict(job, status="unknown")
+            else:
+                not_found = 0
+        return job
+
+    async def _many(self, dns: Iterable[str], operation) -> List[Result]:
+
+        async def _run(dn: str) -> Result:
+            try:
+                return Result(dn, await operation(dn))
+            except (HTTPError, aiohttp.ClientError, asyncio.TimeoutError) as exc:
+                return Result(dn, error=exc)
+
+        return await asyncio.gather(*(_run(dn) for dn in dns))
+
+    async def get_many(self, module: str, dns: Iterable[str]) -> List[Result]:
+        """Open the objects concurrently, failures are returned as `Result.error`."""
+        return await self._many(dns, lambda dn: self.get(module, dn))
+
+    async def delete_many(self, module: str, dns: Iterable[str], missing_ok: bool = True) -> List[Result]:
+        return await self._many(dns, lambda dn: self.delete(module, dn, missing_ok=missing_ok))
+
+    async def modify_many(self, module: str, changes: Dict[str, Dict[str, Any]]) -> List[Result]:
+        """Apply `changes`, a mapping of DN to changed properties, concurrently."""
+        return await self._many(changes, lambda dn: self.modify(module, dn, changes[dn]))
@@ -0,0 +1,20 @@
+# SPDX-License-Identifier: AGPL-3.0-only
+# SPDX-FileCopyrightText: 2026 Univention GmbH
+"""
+Run `udm-cli` (`python3 -m univention.admin.rest.client`) with the persistent discovery cache.
+
+All command line arguments are passed on to the client.
+"""
+
+import runpy
+
+import udm_rest_discovery_cache
+
+
+def main() -> None:
+    udm_rest_discovery_cache.install_from_environment()
+    runpy.run_module("univention.admin.rest.client", run_name="__main__", alter_sys=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,191 @@
+# SPDX-License-Identifier: AGPL-3.0-only
+# SPDX-FileCopyrightText: 2026 Univention GmbH
+"""
+Persistent cache of the discovery resources of the UDM REST API.
+
+`univention.admin.rest.client.UDM` discovers the API by requesting the
+root resource, the module categories and the module metadata before it
+does any real work. This module caches these responses on disk for all
+`requests` sessions after `install()` was called:
+
+- A cached response younger than `max_age` seconds is used without a
+  request to the server.
+- An older one is revalidated with `If-None-Match` or
+  `If-Modified-Since`. On HTTP 304 it is used again, otherwise the new
+  response replaces it.
+
+Only `GET` requests of discovery resources are cached, never searches
+or objects. The cache key contains the URL, a hash of the credentials
+and the `Accept` and `Accept-Language` headers, so different servers,
+users and languages do not share entries.
+"""
+
+import base64
+import hashlib
+import json
+import logging
+import os
+import re
+import tempfile
+import time
+import urllib.parse
+from pathlib import Path
+from typing import Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+log = logging.getLogger(__name__)
+
+FORMAT = 1
+
+# The API root, the module categories (e.g. `users/`), the metadata of a
+# module and the OpenAPI schema, relative to the `udm/` root resource.
+DISCOVERY_PATH = re.compile(
+    r"/udm/(?:|[^/]+/|[^/]+/[^/]+/(?:add|properties|layout|favicon)|openapi\.json|relation/.*|ldap/base/)$",
+)
+
+
+def is_discovery(url: str) -> bool:
+    return DISCOVERY_PATH.search(urllib.parse.urlsplit(url).path) is not None
+
+
+def default_directory() -> Path:
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "udm-rest-api-client"
+
+
+class DiscoveryCache:
+    """Store responses as JSON files named by the hash of their cache key."""
+
+    def __init__(self, directory: Path, max_age: float = 300):
+        self.directory = Path(directory)
+        self.max_age = max_age
+        self.hits = 0
+        self.revalidations = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(request: requests.PreparedRequest) -> str:
+        headers = request.headers
+        credentials = hashlib.sha256(headers.get("Authorization", "").encode("utf-8")).hexdigest()
+        parts = [str(FORMAT), request.url, credentials, headers.get("Accept", ""), headers.get("Accept-Language", "")]
+        return hashlib.sha256("\0".join(parts).encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+
+    def load(self, key: str) -> Optional[Dict]:
+        try:
+            return json.loads(self._path(key).read_text())
+        except FileNotFoundError:
+            return None
+        except ValueError:
+            log.warning("Ignoring the corrupt cache entry %s", self._path(key))
+            return None
+
+    def save(self, key: str, entry: Dict) -> None:
+        self.directory.mkdir(mode=0o700, parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.directory, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(entry, f)
+            os.replace(tmp, self._path(key))
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+    def store(self, key: str, response: requests.Response) -> None:
+        self.save(key, {
+            "url": response.url,
+            "status": response.status_code,
+            "reason": response.reason,
+            "headers": dict(response.headers),
+            "body": base64.b64encode(response.content).decode("ascii"),
+            "validated": time.time(),
+        })
+
+    def is_fresh(self, entry: Dict) -> bool:
+        return time.time() - entry["validated"] < self.max_age
+
+
+def build_response(entry: Dict, request: requests.PreparedRequest) -> requests.Response:
+    response = requests.Response()
+    response.status_code = entry["status"]
+    response.reason = entry["reason"]
+    response.headers = CaseInsensitiveDict(entry["headers"])
+    # The body is stored decoded.
+    response.headers.pop("Content-Encoding", None)
+    response.headers.pop("Content-Length", None)
+    response._content = base64.b64decode(entry["body"])
+    response.encoding = get_encoding_from_headers(response.headers)
+    response.url = entry["url"]
+    response.request = request
+    return response
+
+
+class DiscoveryCacheAdapter(HTTPAdapter):
+    """Transport adapter which answers discovery requests from a `DiscoveryCache`."""
+
+    def __init__(self, cache: DiscoveryCache, **kwargs):
+        super().__init__(**kwargs)
+        self.cache = cache
+
+    def send(self, request: requests.PreparedRequest, **kwargs) -> requests.Response:
+        if request.method != "GET" or not is_discovery(request.url):
+            return super().send(request, **kwargs)
+
+        key = self.cache.key(request)
+        entry = self.cache.load(key)
+        if entry is not None and self.cache.is_fresh(entry):
+            self.cache.hits += 1
+            return build_response(entry, request)
+
+        if entry is not None:
+            request = request.copy()
+            headers = CaseInsensitiveDict(entry["headers"])
+            if "ETag" in headers:
+                request.headers["If-None-Match"] = headers["ETag"]
+            if "Last-Modified" in headers:
+                request.headers["If-Modified-Since"] = headers["Last-Modified"]
+        response = super().send(request, **kwargs)
+
+        try:
+            if response.status_code == 304 and entry is not None:
+                self.cache.revalidations += 1
+                entry["validated"] = time.time()
+                self.cache.save(key, entry)
+                return build_response(entry, request)
+            self.cache.misses += 1
+            if response.status_code == 200:
+                self.cache.store(key, response)
+        except OSError as exc:
+            log.warning("Writing the discovery cache failed: %s", exc)
+            if response.status_code == 304:
+                return build_response(entry, request)
+        return response
+
+
+def install(cache: DiscoveryCache) -> None:
+    """Mount the cache into every `requests.Session` created afterwards."""
+    init = requests.Session.__init__
+
+    def __init__(session, *args, **kwargs):
+        init(session, *args, **kwargs)
+        adapter = DiscoveryCacheAdapter(cache)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+
+    requests.Session.__init__ = __init__
+
+
+def install_from_environment() -> Optional[DiscoveryCache]:
+    """Install the cache configured by `UDM_CLIENT_CACHE_DIR` and `UDM_CLIENT_CACHE_MAX_AGE`."""
+    directory = os.environ.get("UDM_CLIENT_CACHE_DIR", str(default_directory()))
+    if not directory:
+        return None
+    cache = DiscoveryCache(Path(directory), float(os.environ.get("UDM_CLIENT_CACHE_MAX_AGE", "300")))
+    install(cache)
+    return cache
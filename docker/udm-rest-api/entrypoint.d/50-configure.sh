@@ -0,0 +1,11 @@
+#!/bin/bash
+# SPDX-License-Identifier: AGPL-3.0-only
+# SPDX-FileCopyrightText: 2021-2026 Univention GmbH
+
+set -euxo pipefail
+
+############################################################
+# Prepare LDAP TLS certificates and settings, configure
+# Univention Directory Reports and link the LDAP secrets.
+# The UCR is loaded only once for all of these steps.
+/usr/local/bin/univention-udm-rest-api-configure.py
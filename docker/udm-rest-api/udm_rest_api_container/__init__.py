@@ -0,0 +1,10 @@
+# SPDX-License-Identifier: AGPL-3.0-only
+# SPDX-FileCopyrightText: 2026 Univention GmbH
+"""
+Container specific runtime extensions of the UDM REST API.
+
+The UDM REST API itself is installed from the upstream Debian packages.
+The modules in this package are loaded by
+`/usr/local/bin/univention-udm-rest-api.py` before the server starts
+and adjust its runtime behavior for the container environment.
+"""
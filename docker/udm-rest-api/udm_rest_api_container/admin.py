@@ -0,0 +1,77 @@
+# SPDX-License-Identifier: AGPL-3.0-only
+# SPDX-FileCopyrightText: 2026 Univention GmbH
+"""
+Operator-only HTTP endpoint of the UDM REST API container.
+
+The endpoint runs in a background thread of the server process and
+listens on the loopback interface by default, so it is only reachable
+through `kubectl port-forward` or `kubectl exec`. Other modules register
+their resources with `AdminServer.route`.
+"""
+
+import json
+import logging
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Optional, Tuple
+
+log = logging.getLogger(__name__)
+
+Response = Tuple[int, str, bytes]
+
+
+def json_response(data, status: int = 200) -> Response:
+    return status, "application/json", json.dumps(data, indent=2).encode("utf-8")
+
+
+class AdminServer:
+    """Dispatch `GET` requests by path prefix to the registered callbacks."""
+
+    def __init__(self, address: str, port: int):
+        self.address = address
+        self.port = port
+        self.routes: Dict[str, Callable[[str], Response]] = {}
+        self._server: Optional[ThreadingHTTPServer] = None
+
+    def route(self, prefix: str, callback: Callable[[str], Response]) -> None:
+        """Call `callback` with the remainder of the path for requests below `prefix`."""
+        self.routes[prefix] = callback
+
+    def dispatch(self, path: str) -> Response:
+        path = path.split("?", 1)[0]
+        for prefix in sorted(self.routes, key=len, reverse=True):
+            if path == prefix.rstrip("/") or path.startswith(prefix):
+                return self.routes[prefix](path[len(prefix):])
+        return json_response({"error": "not found", "resources": sorted(self.routes)}, 404)
+
+    def start(self) -> None:
+        admin = self
+
+        class Handler(BaseHTTPRequestHandler):
+
+            def do_GET(self):
+                try:
+                    status, content_type, body = admin.dispatch(self.path)
+                except Exception:
+                    log.exception("Admin request %s failed", self.path)
+                    status, content_type, body = json_response({"error": "internal error"}, 500)
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                log.debug("admin: " + format, *args)
+
+        self._server = ThreadingHTTPServer((self.address, self.port), Handler)
+        self.port = self._server.server_address[1]
+        thread = threading.Thread(target=self._server.serve_forever, name="admin-server", daemon=True)
+        thread.start()
+        log.info("Admin endpoint listening on %s:%d", self.address, self.port)
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
@@ -0,0 +1,214 @@
+# SPDX-License-Identifier: AGPL-3.0-only
+# SPDX-FileCopyrightText: 2026 Univention GmbH
+"""
+Cache the authorized-groups decision of the UDM REST API per user DN.
+
+For every request the server checks with the machine account whether
+the bound user is member of one of the groups configured in the UCR
+variables `directory/manager/rest/authorized-groups/*`. The decision
+is cached for a configurable time. Denials are only cached when a
+negative TTL is configured.
+
+The cache is cleared when the `entryCSN` of one of the authorized
+groups changes. A background thread reads them every check interval
+with a short LDAP timeout, so a slow LDAP server does not block the
+event loop. Changes of nested groups are not detected, they take
+effect after the TTL expired.
+"""
+
+import copy
+import functools
+import inspect
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, List, Optional, Tuple
+
+from . import hooks
+
+log = logging.getLogger(__name__)
+
+MODULE = "univention.admin.rest.module"
+CLASS = "ResourceBase"
+METHOD = "_auth_check_allowed_groups"
+UCR_PREFIX = "directory/manager/rest/authorized-groups/"
+
+
+class AuthorizationCache:
+    """LRU cache of authorization decisions with positive and negative TTL."""
+
+    def __init__(
+        self, ttl: float, negative_ttl: float = 0, max_entries: int = 10000,
+        fingerprint: Optional[Callable[[], object]] = None, check_interval: float = 10,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.max_entries = max_entries
+        self.fingerprint = fingerprint
+        self.check_interval = check_interval
+        self.clock = clock
+        self.entries: "OrderedDict[str, Tuple[float, Optional[BaseException]]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self._lock = threading.Lock()
+        self._fingerprint = None
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def refresh(self) -> None:
+        """Read the fingerprint of the authorized groups and clear the cache if it changed."""
+        try:
+            fingerprint = self.fingerprint()
+        except Exception:
+            log.exception("Reading the authorized groups failed")
+            fingerprint = None
+        with self._lock:
+            if fingerprint is None or fingerprint != self._fingerprint:
+                if self.entries:
+                    log.debug("Authorized groups changed, clearing %d cached decisions", len(self.entries))
+                    self.invalidations += 1
+                self.entries.clear()
+            self._fingerprint = fingerprint
+
+    def _run(self) -> None:
+        while True:
+            self.refresh()
+            if self._stopped.wait(self.check_interval):
+                return
+
+    def start(self) -> None:
+        """Refresh the fingerprint every `check_interval` seconds in a thread, off the event loop."""
+        if self.fingerprint is None or self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name="authz-cache-refresh", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+
+    def get(self, user_dn: str) -> Tuple[bool, Optional[BaseException]]:
+        """Return `(cached, denial)` for `user_dn`."""
+        now = self.clock()
+        with self._lock:
+            entry = self.entries.get(user_dn.lower())
+            if entry is None or entry[0] <= now:
+                self.misses += 1
+                return False, None
+            self.entries.move_to_end(user_dn.lower())
+            self.hits += 1
+            return True, entry[1]
+
+    def put(self, user_dn: str, denial: Optional[BaseException] = None) -> None:
+        ttl = self.ttl if denial is None else self.negative_ttl
+        if ttl <= 0:
+            return
+        with self._lock:
+            self.entries[user_dn.lower()] = (self.clock() + ttl, denial)
+            self.entries.move_to_end(user_dn.lower())
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self.entries.clear()
+
+
+def _is_denial(exc: BaseException) -> bool:
+    return getattr(exc, "status_code", None) in (401, 403)
+
+
+def patch(cache: AuthorizationCache, cls, method: str = METHOD) -> bool:
+    """Wrap the authorization check `cls.method` which raises an HTTP error on denial."""
+    check = getattr(cls, method, None)
+    if check is None:
+        log.warning("%s.%s not found, the authorization cache is disabled", cls.__name__, method)
+        return False
+
+    def _cached(handler) -> bool:
+        user_dn = getattr(handler.request, "user_dn", None)
+        if not user_dn:
+            return False
+        cached, denial = cache.get(user_dn)
+        if denial is not None:
+            raise copy.copy(denial).with_traceback(None)
+        return cached
+
+    def _store(handler, exc: Optional[BaseException]) -> None:
+        user_dn = getattr(handler.request, "user_dn", None)
+        if user_dn and (exc is None or _is_denial(exc)):
+            cache.put(user_dn, exc)
+
+    if inspect.iscoroutinefunction(check):
+        @functools.wraps(check)
+        async def _check(handler, *args, **kwargs):
+            if _cached(handler):
+                return None
+            try:
+                result = await check(handler, *args, **kwargs)
+            except Exception as exc:
+                _store(handler, exc)
+                raise
+            _store(handler, None)
+            return result
+    else:
+        @functools.wraps(check)
+        def _check(handler, *args, **kwargs):
+            if _cached(handler):
+                return None
+            try:
+                result = check(handler, *args, **kwargs)
+            except Exception as exc:
+                _store(handler, exc)
+                raise
+            _store(handler, None)
+            return result
+
+    setattr(cls, method, _check)
+    return True
+
+
+def authorized_groups(ucr) -> List[str]:
+    return [value for key, value in ucr.items() if key.startswith(UCR_PREFIX) and value]
+
+
+def group_fingerprint(groups: List[str], timeout: float = 5) -> Callable[[], object]:
+    """Read the `entryCSN` of the authorized groups with the machine account."""
+    connection = []
+
+    def _fingerprint():
+        import ldap
+        from univention.uldap import getMachineConnection
+
+        if not connection:
+            lo = getMachineConnection(ldap_master=False)
+            lo.lo.set_option(ldap.OPT_NETWORK_TIMEOUT, timeout)
+            lo.lo.set_option(ldap.OPT_TIMEOUT, timeout)
+            connection.append(lo)
+        lo = connection[0]
+        try:
+            return tuple(
+                tuple(attrs.get("entryCSN", []))
+                for group in groups
+                for _dn, attrs in lo.search(base=group, scope="base", attr=["entryCSN"])
+            )
+        except Exception:
+            connection.clear()
+            raise
+
+    return _fingerprint
+
+
+def install(cache: AuthorizationCache, registry) -> None:
+    """Patch the server as soon as it imports its resource module."""
+    hooks.when_imported(MODULE, lambda module: patch(cache, getattr(module, CLASS)))
+    cache.start()
+    registry.counter("udm_rest_authz_cache_hits_total", "Authorization decisions served from the cache.",
+                     lambda: cache.hits)
+    registry.counter("udm_rest_authz_cache_misses_total", "Authorization decisions which had to be resolved.",
+                     lambda: cache.misses)
+    registry.counter("udm_rest_authz_cache_invalidations_total",
+                     "Cache clears caused by changes of the authorized groups.", lambda: cache.invalidations)
+    registry.gauge("udm_rest_authz_cache_entries", "Cached authorization decisions.", lambda: len(cache.entries))
@@ -0,0 +1,348 @@
+# SPDX-License-Identifier: AGPL-3.0-only
+# SPDX-FileCopyrightText: 2026 Univention GmbH
+"""
+Delete all objects of a UDM module which match a filter in a server-side job.
+
+    POST /udm/<module>/bulk-delete  {"filter": "(univentionBlockedUntil<=20260101000000Z)",
+                                     "position": "cn=blocklists,cn=internal", "scope": "sub",
+                                     "rate": 20, "dryRun": false}
+    -> 202 Accepted, Location: /udm/bulk-delete/<job>
+
+    GET /udm/bulk-delete/<job>     progress of the job
+    DELETE /udm/bulk-delete/<job>  cancel the job
+
+The filter is a UDM filter as used by the search resource, property
+names are mapped to their LDAP attributes. The job runs in a thread with
+its own LDAP connection bound as the requesting user, so LDAP ACLs
+apply. Every object is opened and removed through UDM, so hooks and
+the cleanup of references run as for a single `DELETE`. The deletion
+rate of each job is limited to the configured maximum, so a pod removes
+at most `max_jobs` times `max_rate` objects per second.
+
+Jobs are kept in the memory of the server process which started them.
+With more than one replica the progress resource answers 404 on the
+other pods, the job id starts with the host name of the pod running it.
+
+The job needs the bind DN and password of the request to open its own
+connection. Requests authenticated otherwise, e.g. with OAUTHBEARER,
+are answered with 501. The connection is opened and the module is
+initialized in a worker thread, not on the event loop.
+"""
+
+import asyncio
+import functools
+import json
+import logging
+import os
+import socket
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, List, Optional
+
+from . import hooks
+
+log = logging.getLogger(__name__)
+
+MODULE = "univention.admin.rest.module"
+START_PATTERN = r".*/udm/([^/]+/[^/]+)/bulk-delete/?"
+JOB_PATTERN = r".*/udm/bulk-delete/([^/]+)/?"
+MAX_ERRORS = 100
+
+
+class UnsupportedAuthentication(Exception):
+    """The LDAP connection of the request cannot be opened again for a job."""
+
+
+class ConnectionFailed(Exception):
+    """The LDAP connection of a job could not be opened."""
+
+
+class Job:
+    """Progress of a bulk deletion, updated by the thread running it."""
+
+    def __init__(
+        self, module: str, filter: str, position: Optional[str] = None, scope: str = "sub", rate: float = 20,
+        dry_run: bool = False, clock: Callable[[], float] = time.monotonic, sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.id = f"{socket.gethostname()}-{uuid.uuid4().hex[:12]}"
+        self.module = module
+        self.filter = filter
+        self.position = position
+        self.scope = scope
+        self.rate = rate
+        self.dry_run = dry_run
+        self.clock = clock
+        self.sleep = sleep
+        self.status = "pending"
+        self.matched = 0
+        self.deleted = 0
+        self.failed = 0
+        self.errors: List[Dict[str, str]] = []
+        self.error: Optional[str] = None
+        self.started: Optional[float] = None
+        self.finished: Optional[float] = None
+        self.cancelled = threading.Event()
+
+    @property
+    def done(self) -> bool:
+        return self.status in ("done", "failed", "cancelled")
+
+    def run(self, search: Callable[[], Iterable[str]], remove: Callable[[str], None]) -> None:
+        self.status = "running"
+        self.started = time.time()
+        try:
+            interval = 1 / self.rate
+            next_at = self.clock()
+            for dn in search():
+                if self.cancelled.is_set():
+                    self.status = "cancelled"
+                    return
+                self.matched += 1
+                if self.dry_run:
+                    continue
+                wait = next_at - self.clock()
+                if wait > 0:
+                    self.sleep(wait)
+                next_at = max(next_at, self.clock()) + interval
+                try:
+                    remove(dn)
+                except Exception as exc:
+                    log.debug("Bulk delete %s: removing %s failed", self.id, dn, exc_info=True)
+                    self.failed += 1
+                    if len(self.errors) < MAX_ERRORS:
+                        self.errors.append({"dn": dn, "error": str(exc)})
+                else:
+                    self.deleted += 1
+            self.status = "done"
+        except Exception as exc:
+            log.exception("Bulk delete %s failed", self.id)
+            self.status = "failed"
+            self.error = str(exc)
+        finally:
+            self.finished = time.time()
+            log.info("Bulk delete %s of %s %s: %d matched, %d deleted, %d failed",
+                     self.id, self.module, self.status, self.matched, self.deleted, self.failed)
+
+    def to_json(self) -> Dict:
+        end = self.finished or time.time()
+        return {
+            "id": self.id,
+            "module": self.module,
+            "filter": self.filter,
+            "position": self.position,
+            "scope": self.scope,
+            "dryRun": self.dry_run,
+            "rate": self.rate,
+            "status": self.status,
+            "matched": self.matched,
+            "deleted": self.deleted,
+            "failed": self.failed,
+            "errors": self.errors,
+            "error": self.error,
+            "started": self.started,
+            "finished": self.finished,
+            "duration": end - self.started if self.started else None,
+        }
+
+
+class JobManager:
+    """Run a bounded number of jobs in threads and keep the latest ones for their progress resource."""
+
+    def __init__(self, max_rate: float = 20, max_jobs: int = 2, keep: int = 100):
+        self.max_rate = max_rate
+        self.max_jobs = max_jobs
+        self.keep = keep
+        self.jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self.objects_deleted = 0
+        self._lock = threading.Lock()
+
+    @property
+    def running(self) -> int:
+        return sum(1 for job in self.jobs.values() if not job.done)
+
+    def rate(self, requested: Optional[float]) -> float:
+        if requested is None or requested <= 0:
+            return self.max_rate
+        return min(float(requested), self.max_rate)
+
+    def start(self, job: Job, search: Callable[[], Iterable[str]], remove: Callable[[str], None]) -> bool:
+        """Start `job` in a thread, return False if too many jobs are running."""
+        with self._lock:
+            if self.running >= self.max_jobs:
+                return False
+            self.jobs[job.id] = job
+            while len(self.jobs) > self.keep:
+                oldest = next(iter(self.jobs.values()))
+                if not oldest.done:
+                    break
+                self.jobs.popitem(last=False)
+
+        def _run():
+            try:
+                job.run(search, remove)
+            finally:
+                self.objects_deleted += job.deleted
+
+        threading.Thread(target=_run, name=f"bulk-delete-{job.id}", daemon=True).start()
+        return True
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self.jobs.get(job_id)
+
+
+def clone_connection(lo):
+    """Open a new connection bound as the user of the `univention.admin.uldap.access` `lo`."""
+    inner = getattr(lo, "lo", lo)
+    binddn, bindpw = getattr(inner, "binddn", None), getattr(inner, "bindpw", None)
+    if not binddn or not bindpw:
+        raise UnsupportedAuthentication("bulk delete requires authentication with a username and password")
+
+    import ldap
+    import univention.admin.uldap
+    import univention.uldap
+
+    try:
+        return univention.admin.uldap.access(lo=univention.uldap.access(
+            host=inner.host, port=inner.port, base=inner.base, binddn=binddn, bindpw=bindpw,
+            # The defaults of `access` require StartTLS, keep the settings of the request's connection.
+            start_tls=getattr(inner, "start_tls", 2), ca_certfile=getattr(inner, "ca_certfile", None),
+            uri=getattr(inner, "uri", None),
+        ))
+    except ldap.LDAPError as exc:
+        raise ConnectionFailed(f"connecting to the LDAP server failed: {exc}") from exc
+
+
+def udm_operations(lo, module_name: str, filter: str, position: Optional[str], scope: str):
+    """Return the `search` and `remove` callables of a job which use UDM on the connection `lo`."""
+    import ldap.dn
+    import univention.admin.modules
+    import univention.admin.objects
+    import univention.admin.uldap
+
+    module = univention.admin.modules.get(module_name)
+    if module is None:
+        raise LookupError(f"unknown module {module_name}")
+    ldap_position = univention.admin.uldap.position(lo.base)
+    try:
+        univention.admin.modules.init(lo, ldap_position, module)
+    except ldap.LDAPError as exc:
+        raise ConnectionFailed(f"initializing {module_name} failed: {exc}") from exc
+
+    def search() -> List[str]:
+        ldap_filter = module.lookup_filter(filter or None, lo)
+        dns = lo.searchDn(filter=str(ldap_filter), base=position or lo.base, scope=scope)
+        # Children first, so that matching containers are empty when they are removed.
+        return sorted(dns, key=lambda dn: len(ldap.dn.str2dn(dn)), reverse=True)
+
+    def remove(dn: str) -> None:
+        obj = univention.admin.objects.get(module, None, lo, ldap_position, dn)
+        obj.open()
+        obj.remove()
+        univention.admin.objects.performCleanup(obj)
+
+    return search, remove
+
+
+def _parse(body: bytes) -> Dict:
+    try:
+        data = json.loads(body or b"{}")
+    except ValueError:
+        raise ValueError("the request body is not JSON") from None
+    if not isinstance(data, dict) or not isinstance(data.get("filter"), str) or not data["filter"].strip():
+        raise ValueError("'filter' is required")
+    if data.get("scope", "sub") not in ("base", "one", "sub"):
+        raise ValueError("'scope' must be one of base, one, sub")
+    return data
+
+
+def patch(manager: JobManager, module, operations=udm_operations, connect=clone_connection) -> bool:
+    """Add the bulk delete resources to the `Application` of the server module `module`."""
+    resource = getattr(module, "Resource", None)
+    application = getattr(module, "Application", None)
+    if resource is None or application is None:
+        log.warning("%s has no Resource or Application, bulk delete is disabled", module.__name__)
+        return False
+
+    class _Handler(resource):
+
+        def _reply(self, status: int, data: Dict) -> None:
+            self.set_status(status)
+            self.set_header("Content-Type", "application/json")
+            self.finish(json.dumps(data))
+
+    class BulkDelete(_Handler):
+
+        async def post(self, object_type: str):
+            try:
+                data = _parse(self.request.body)
+            except ValueError as exc:
+                return self._reply(422, {"error": str(exc)})
+            job = Job(
+                object_type, data["filter"], data.get("position"), data.get("scope", "sub"),
+                manager.rate(data.get("rate")), bool(data.get("dryRun", False)),
+            )
+            lo = self.ldap_connection
+
+            def _prepare():
+                return operations(connect(lo), job.module, job.filter, job.position, job.scope)
+
+            try:
+                search, remove = await asyncio.get_running_loop().run_in_executor(None, _prepare)
+            except LookupError as exc:
+                return self._reply(404, {"error": str(exc)})
+            except UnsupportedAuthentication as exc:
+                return self._reply(501, {"error": str(exc)})
+            except ConnectionFailed as exc:
+                return self._reply(502, {"error": str(exc)})
+            if not manager.start(job, search, remove):
+                self.set_header("Retry-After", "60")
+                return self._reply(429, {"error": f"{manager.max_jobs} bulk delete jobs are running"})
+            self.set_header("Location", self.request.path.split("/udm/", 1)[0] + f"/udm/bulk-delete/{job.id}")
+            self._reply(202, job.to_json())
+
+    class BulkDeleteJob(_Handler):
+
+        def _job(self, job_id: str) -> Optional[Job]:
+            job = manager.get(job_id)
+            if job is None:
+                self._reply(404, {"error": f"job {job_id} not found on {socket.gethostname()}"})
+            return job
+
+        async def get(self, job_id: str):
+            job = self._job(job_id)
+            if job is not None:
+                self._reply(200, job.to_json())
+
+        async def delete(self, job_id: str):
+            job = self._job(job_id)
+            if job is not None:
+                job.cancelled.set()
+                self._reply(202, job.to_json())
+
+    init = application.__init__
+
+    @functools.wraps(init)
+    def __init__(app, *args, **kwargs):
+        init(app, *args, **kwargs)
+        # Added rules take precedence over the object resources of the server.
+        app.add_handlers(r".*$", [(START_PATTERN, BulkDelete), (JOB_PATTERN, BulkDeleteJob)])
+
+    application.__init__ = __init__
+    return True
+
+
+def install(manager: JobManager, registry) -> None:
+    """Add the resources as soon as the server imports its resource module."""
+    hooks.when_imported(MODULE, lambda module: patch(manager, module))
+    registry.gauge("udm_rest_bulk_delete_jobs_running", "Running bulk delete jobs.", lambda: manager.running)
+    registry.counter("udm_rest_bulk_delete_objects_deleted_total", "Objects removed by finished bulk delete jobs.",
+                     lambda: manager.objects_deleted)
+
+
+def from_environment() -> JobManager:
+    return JobManager(
+        max_rate=float(os.environ.get("UDM_REST_BULK_DELETE_MAX_RATE", "20")),
+        max_jobs=int(os.environ.get("UDM_REST_BULK_DELETE_MAX_JOBS", "2")),
+    )
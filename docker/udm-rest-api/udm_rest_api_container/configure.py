@@ -0,0 +1,153 @@
+# SPDX-License-Identifier: AGPL-3.0-only
+# SPDX-FileCopyrightText: 2026 Univention GmbH
+"""
+Prepare the container configuration in a single process.
+
+The Univention Config Registry is loaded once and used to render
+`/etc/ldap/ldap.conf`, to commit the configuration of the Univention
+Directory Reports and to link the LDAP secrets, instead of starting a
+new `ucr` process for every single value.
+"""
+
+import argparse
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Iterable, List, Mapping, Optional
+
+log = logging.getLogger(__name__)
+
+CA_DIR = Path("/etc/univention/ssl/ucsCA")
+LDAP_CONF = Path("/etc/ldap/ldap.conf")
+LDAP_SECRET = Path("/etc/ldap.secret")
+MACHINE_SECRET = Path("/etc/machine.secret")
+DIRECTORY_REPORTS_CONFIG = "/etc/univention/directory/reports/config.ini"
+
+# In Kubernetes `/etc/ldap/ldap.conf` and the secrets are mounted, the
+# init container of the deployment only runs the `directory-reports` step.
+STEPS = ("ldap-conf", "secrets", "directory-reports")
+
+TLS_REQCERT = {
+    "2": "demand",
+    "1": "allow",
+    "0": "never",
+}
+
+
+class ConfigurationError(Exception):
+    pass
+
+
+def _symlink(source: str, target: Path) -> None:
+    """Equivalent of `ln --symbolic --force`."""
+    target.unlink(missing_ok=True)
+    target.symlink_to(source)
+
+
+def link_ca_certificate(ucr: Mapping[str, str], env: Mapping[str, str], ca_dir: Path = CA_DIR) -> str:
+    """Link the CA certificate unless TLS is off and return the `TLS_REQCERT` setting."""
+    start_tls = ucr.get("uldap/start-tls") or "2"
+    if start_tls not in TLS_REQCERT:
+        raise ConfigurationError("UCR variable 'uldap/start-tls' must be one of: 0, 1, 2")
+    if start_tls == "0":
+        return TLS_REQCERT[start_tls]
+
+    ca_cert_file = env.get("CA_CERT_FILE") or "/run/secrets/ca_cert"
+    if not os.path.isfile(ca_cert_file):
+        raise ConfigurationError(f"$CA_CERT_FILE is not a file at {ca_cert_file}")
+    ca_dir.mkdir(parents=True, exist_ok=True)
+    _symlink(ca_cert_file, ca_dir / "CAcert.pem")
+    return TLS_REQCERT[start_tls]
+
+
+def render_ldap_conf(ucr: Mapping[str, str], tls_reqcert: str, ca_dir: Path = CA_DIR) -> str:
+    tls_cacert = f"TLS_CACERT {ca_dir / 'CAcert.pem'}" if tls_reqcert != "never" else ""
+    return (
+        "# This file should be world readable but not world writable.\n"
+        "\n"
+        f"{tls_cacert}\n"
+        f"TLS_REQCERT {tls_reqcert}\n"
+        "\n"
+        f"URI ldap://{ucr.get('ldap/server/name', '')}:{ucr.get('ldap/server/port', '')}\n"
+        "\n"
+        f"BASE {ucr.get('ldap/base', '')}\n"
+    )
+
+
+def write_ldap_conf(content: str, path: Path = LDAP_CONF) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # In Kubernetes the file is provided read-only by a ConfigMap.
+    if not os.access(path, os.W_OK):
+        log.info("Keeping %s, it is not writable", path)
+        return
+    path.write_text(content)
+    path.chmod(0o644)
+
+
+def link_secrets(
+    env: Mapping[str, str], ldap_secret: Path = LDAP_SECRET, machine_secret: Path = MACHINE_SECRET,
+) -> None:
+    # TODO: Does this container really need to know this secret?
+    ldap_secret_file = env.get("LDAP_SECRET_FILE") or "/run/secrets/ldap_secret"
+    if os.path.isfile(ldap_secret_file):
+        log.info("Using LDAP admin secret")
+        _symlink(ldap_secret_file, ldap_secret)
+    else:
+        log.info("No LDAP admin secret provided!")
+
+    # Machine account allows checking which users are authorized to use the API
+    machine_secret_file = env.get("MACHINE_SECRET_FILE") or "/run/secrets/machine_secret"
+    if os.path.isfile(machine_secret_file):
+        log.info("Using LDAP machine secret from file")
+        _symlink(machine_secret_file, machine_secret)
+    elif env.get("MACHINE_SECRET"):
+        log.info("Using LDAP machine secret from env")
+        machine_secret.write_text(env["MACHINE_SECRET"])
+    else:
+        raise ConfigurationError(
+            f"No LDAP machine secret found at {machine_secret_file} and $MACHINE_SECRET not set!\n"
+            "Check the $MACHINE_SECRET_FILE variable and the file that it points to.",
+        )
+
+
+def commit_directory_reports(ucr) -> None:
+    """Equivalent of `ucr commit` for the directory reports, reusing the loaded registry."""
+    from univention.config_registry.handler import ConfigHandlers
+
+    handlers = ConfigHandlers()
+    handlers.load()
+    handlers.commit(ucr, [DIRECTORY_REPORTS_CONFIG])
+
+
+def configure(ucr, env: Mapping[str, str], steps: Iterable[str] = STEPS) -> None:
+    start = time.monotonic()
+    if "ldap-conf" in steps:
+        tls_reqcert = link_ca_certificate(ucr, env)
+        write_ldap_conf(render_ldap_conf(ucr, tls_reqcert))
+    if "secrets" in steps:
+        link_secrets(env)
+    if "directory-reports" in steps:
+        commit_directory_reports(ucr)
+    log.info("Configured the container in %.3f seconds", time.monotonic() - start)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    from univention.config_registry import ConfigRegistry
+
+    parser = argparse.ArgumentParser(description="Prepare the container configuration.")
+    parser.add_argument(
+        "--step", action="append", choices=STEPS, dest="steps",
+        help="run only the given step, may be repeated (default: all steps)",
+    )
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(format="%(message)s", level=logging.INFO)
+    ucr = ConfigRegistry()
+    ucr.load()
+    try:
+        configure(ucr, os.environ, args.steps or STEPS)
+    except ConfigurationError as exc:
+        log.error("%s", exc)
+        return 1
+    return 0
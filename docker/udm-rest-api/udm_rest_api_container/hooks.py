@@ -0,0 +1,67 @@
+# SPDX-License-Identifier: AGPL-3.0-only
+# SPDX-FileCopyrightText: 2026 Univention GmbH
+"""
+Run callbacks once a module of the UDM REST API has been imported.
+
+Importing the server modules ahead of time would change the order of
+their initialization, so the runtime extensions patch them right after
+the server imported them itself.
+"""
+
+import importlib.abc
+import logging
+import sys
+from typing import Callable, Dict, List
+
+log = logging.getLogger(__name__)
+
+Callback = Callable[[object], None]
+
+
+class PostImportFinder(importlib.abc.MetaPathFinder):
+
+    def __init__(self):
+        self.callbacks: Dict[str, List[Callback]] = {}
+
+    def find_spec(self, fullname, path, target=None):
+        if fullname not in self.callbacks:
+            return None
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is not None:
+                break
+        else:
+            return None
+
+        callbacks = self.callbacks.pop(fullname)
+        exec_module = spec.loader.exec_module
+
+        def _exec_module(module):
+            exec_module(module)
+            _run(callbacks, module)
+
+        spec.loader.exec_module = _exec_module
+        return spec
+
+
+def _run(callbacks: List[Callback], module) -> None:
+    for callback in callbacks:
+        try:
+            callback(module)
+        except Exception:
+            log.exception("Patching %s failed", module.__name__)
+
+
+_finder = PostImportFinder()
+
+
+def when_imported(name: str, callback: Callback) -> None:
+    """Call `callback` with the module `name` as soon as it is imported."""
+    if name in sys.modules:
+        _run([callback], sys.modules[name])
+        return
+    if _finder not in sys.meta_path:
+        sys.meta_path.insert(0, _finder)
+    _finder.callbacks.setdefault(name, []).append(callback)
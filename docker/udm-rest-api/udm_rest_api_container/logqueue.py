@@ -0,0 +1,247 @@
+# SPDX-License-Identifier: AGPL-3.0-only
+# SPDX-FileCopyrightText: 2026 Univention GmbH
+"""
+Non-blocking, sampled logging for the UDM REST API.
+
+Every handler which gets attached to a logger is replaced by an
+`AsyncHandler` proxy. The proxy only puts the record into a bounded
+queue, a background thread formats and writes it through the original
+handler. When the queue is full the record is dropped and counted, the
+Tornado event loop never waits for the log output.
+
+High-volume debug categories can be sampled, so that verbose logging
+can stay enabled in production.
+"""
+
+import atexit
+import logging
+import os
+import queue
+import threading
+from typing import Dict, Optional, Set
+
+_STOP = object()
+
+
+def parse_sampling(value: str) -> Dict[str, float]:
+    """
+    Parse a sampling specification like `univention.admin.rest=0.1,tornado.access=0.5`.
+
+    Each entry maps a logger name prefix (category) to the share of
+    debug records which shall be written.
+    """
+    rates = {}
+    for item in value.split(","):
+        item = item.strip()
+        if not item:
+            continue
+        category, sep, rate = item.partition("=")
+        if not sep or not category.strip():
+            raise ValueError(f"Invalid log sampling entry: {item!r}")
+        try:
+            rates[category.strip()] = float(rate)
+        except ValueError:
+            raise ValueError(f"Invalid log sampling rate: {item!r}") from None
+        if not 0 <= rates[category.strip()] <= 1:
+            raise ValueError(f"Log sampling rate must be between 0 and 1: {item!r}")
+    return rates
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Pass the configured share of the records below `INFO` of the categories.
+
+    Every record adds the rate of its category to a credit, a record is
+    passed when the credit reaches one, so e.g. 0.7 passes 7 of 10 records.
+
+    The most specific (longest) matching category wins.
+    Records of `INFO` and above are never sampled.
+
+    The filter is attached to every handler, the decision is stored on the
+    record, so that all handlers write the same records.
+    """
+
+    ATTRIBUTE = "udm_rest_sampled"
+
+    def __init__(self, rates: Dict[str, float]):
+        super().__init__()
+        self.rates = dict(sorted(rates.items(), key=lambda item: -len(item[0])))
+        # The first record of a category is passed.
+        self.credits = {category: 1 - rate if rate > 0 else 0 for category, rate in self.rates.items()}
+        self.sampled_out = 0
+
+    def _category(self, name: str) -> Optional[str]:
+        for category in self.rates:
+            if name == category or name.startswith(category + "."):
+                return category
+        return None
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.INFO:
+            return True
+        passed = getattr(record, self.ATTRIBUTE, None)
+        if passed is None:
+            passed = self._sample(record)
+            setattr(record, self.ATTRIBUTE, passed)
+        return passed
+
+    def _sample(self, record: logging.LogRecord) -> bool:
+        category = self._category(record.name)
+        if category is None:
+            return True
+        rate = self.rates[category]
+        if rate >= 1:
+            return True
+        credit = self.credits[category] + rate
+        # Tolerate the rounding errors of summing up rates like 0.1.
+        if credit >= 1 - 1e-9:
+            self.credits[category] = credit - 1
+            return True
+        self.credits[category] = credit
+        self.sampled_out += 1
+        return False
+
+
+class LogQueue:
+    """Bounded queue which is drained by a single writer thread."""
+
+    def __init__(self, maxsize: int):
+        self.queue: queue.Queue = queue.Queue(maxsize)
+        self.dropped = 0
+        self._reported = 0
+        self._targets: Set[logging.Handler] = set()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def put(self, target: logging.Handler, record: logging.LogRecord) -> None:
+        self._ensure_started()
+        try:
+            self.queue.put_nowait((target, record))
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+
+    def add_target(self, target: logging.Handler) -> None:
+        self._targets.add(target)
+
+    def _ensure_started(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+            self._thread.start()
+
+    def _after_fork(self) -> None:
+        # Threads do not survive fork(), the child starts its own writer on demand.
+        self.queue = queue.Queue(self.queue.maxsize)
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def _run(self) -> None:
+        while True:
+            item = self.queue.get()
+            if item is _STOP:
+                self._report_dropped()
+                return
+            target, record = item
+            try:
+                target.handle(record)
+            except Exception:
+                target.handleError(record)
+            if self.queue.empty():
+                self._report_dropped()
+
+    def _report_dropped(self) -> None:
+        with self._lock:
+            dropped = self.dropped - self._reported
+            self._reported = self.dropped
+        if not dropped:
+            return
+        record = logging.LogRecord(
+            __name__, logging.WARNING, __file__, 0,
+            "Log queue overflow: dropped %d log records (%d in total)",
+            (dropped, self.dropped), None,
+        )
+        for target in list(self._targets):
+            if record.levelno >= target.level:
+                target.handle(record)
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Write all pending records and stop the writer thread."""
+        if self._thread is None or not self._thread.is_alive():
+            return
+        self.queue.put(_STOP)
+        self._thread.join(timeout)
+
+
+class AsyncHandler(logging.Handler):
+    """Proxy which hands records of `target` over to a `LogQueue`."""
+
+    def __init__(self, target: logging.Handler, log_queue: LogQueue):
+        super().__init__()
+        self.target = target
+        self.log_queue = log_queue
+        log_queue.add_target(target)
+
+    def handle(self, record: logging.LogRecord) -> bool:
+        if record.levelno < self.target.level:
+            return False
+        return super().handle(record)
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            # Merge the arguments now: they may be mutated before the writer
+            # thread gets to them.
+            record.msg = record.getMessage()
+            record.args = None
+        except Exception:
+            self.handleError(record)
+            return
+        self.log_queue.put(self.target, record)
+
+    def setFormatter(self, fmt: Optional[logging.Formatter]) -> None:
+        self.target.setFormatter(fmt)
+
+    def flush(self) -> None:
+        self.target.flush()
+
+    def close(self) -> None:
+        self.target.close()
+        super().close()
+
+
+def install(maxsize: int, rates: Optional[Dict[str, float]] = None) -> Optional[LogQueue]:
+    """
+    Wrap every handler which gets attached to a logger from now on.
+
+    A `maxsize` of `0` keeps logging synchronous, only sampling is applied then.
+    """
+    log_queue = LogQueue(maxsize) if maxsize > 0 else None
+    sampling = SamplingFilter(rates) if rates else None
+    add_handler = logging.Logger.addHandler
+    remove_handler = logging.Logger.removeHandler
+
+    def _add_handler(self: logging.Logger, hdlr: logging.Handler) -> None:
+        if any(isinstance(handler, AsyncHandler) and handler.target is hdlr for handler in self.handlers):
+            return
+        if log_queue is not None and not isinstance(hdlr, (AsyncHandler, logging.NullHandler)):
+            hdlr = AsyncHandler(hdlr, log_queue)
+        if sampling is not None and sampling not in hdlr.filters:
+            hdlr.addFilter(sampling)
+        add_handler(self, hdlr)
+
+    def _remove_handler(self: logging.Logger, hdlr: logging.Handler) -> None:
+        for handler in list(self.handlers):
+            if isinstance(handler, AsyncHandler) and handler.target is hdlr:
+                hdlr = handler
+                break
+        remove_handler(self, hdlr)
+
+    logging.Logger.addHandler = _add_handler
+    logging.Logger.removeHandler = _remove_handler
+    if log_queue is not None:
+        os.register_at_fork(after_in_child=log_queue._after_fork)
+        atexit.register(log_queue.stop, 5)
+    return log_queue
@@ -0,0 +1,84 @@
+# SPDX-License-Identifier: AGPL-3.0-only
+# SPDX-FileCopyrightText: 2026 Univention GmbH
+"""
+Metrics of the runtime extensions in the Prometheus text format.
+
+Metrics are read from callbacks when they are scraped, so the hot code
+paths only increment plain integer attributes.
+"""
+
+import functools
+from typing import Callable, Iterable, List, NamedTuple, Optional
+
+from .admin import AdminServer, Response
+
+
+class Metric(NamedTuple):
+    name: str
+    kind: str
+    help: str
+    value: Callable[[], float]
+
+
+class Registry:
+
+    def __init__(self):
+        self.metrics: List[Metric] = []
+
+    def counter(self, name: str, help: str, value: Callable[[], float]) -> None:
+        self.metrics.append(Metric(name, "counter", help, value))
+
+    def gauge(self, name: str, help: str, value: Callable[[], float]) -> None:
+        self.metrics.append(Metric(name, "gauge", help, value))
+
+    def render(self) -> str:
+        lines = []
+        for metric in self.metrics:
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.append(f"{metric.name} {metric.value()}")
+        return "\n".join(lines) + "\n"
+
+    def routes(self, admin: AdminServer) -> None:
+        admin.route("/metrics", self._get_metrics)
+
+    def _get_metrics(self, path: str) -> Response:
+        return 200, "text/plain; version=0.0.4; charset=utf-8", self.render().encode("utf-8")
+
+
+class RequestCounter:
+    """Count the requests which are handled and in flight in this process."""
+
+    def __init__(self):
+        self.in_flight = 0
+        self.total = 0
+
+    def patch(self, handler_class) -> None:
+        """Wrap the coroutine `handler_class._execute` which handles a Tornado request."""
+        execute = handler_class._execute
+
+        @functools.wraps(execute)
+        async def _execute(handler, *args, **kwargs):
+            self.in_flight += 1
+            try:
+                return await execute(handler, *args, **kwargs)
+            finally:
+                self.in_flight -= 1
+                self.total += 1
+
+        handler_class._execute = _execute
+
+
+def install(counter: RequestCounter, registry: Registry, handler_classes: Optional[Iterable] = None) -> None:
+    """Count requests handled by Tornado request handlers."""
+    if handler_classes is None:
+        import tornado.web
+        handler_classes = [tornado.web.RequestHandler]
+    for handler_class in handler_classes:
+        counter.patch(handler_class)
+    registry.gauge("udm_rest_requests_in_flight", "Requests currently handled by the server.",
+                   lambda: counter.in_flight)
+    registry.counter("udm_rest_requests_total", "Requests handled by the server.", lambda: counter.total)
+
+
+registry = Registry()
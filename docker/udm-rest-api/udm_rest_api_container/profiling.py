@@ -0,0 +1,196 @@
+# SPDX-License-Identifier: AGPL-3.0-only
+# SPDX-FileCopyrightText: 2026 Univention GmbH
+"""
+Opt-in profiling of selected requests of the UDM REST API.
+
+A request is profiled when it carries the header `X-UDM-Profile` with
+the configured operator token, or when it is picked by the sampling
+rate. Only one request is profiled at a time. As all requests share the
+Tornado event loop, a profile also contains the work done for other
+requests while the profiled one is in flight.
+
+Profiles are written in the collapsed stack format
+(`frame;frame;frame count`), which is understood by `flamegraph.pl`
+and speedscope. A sampler thread records the stacks of all threads in
+wall-clock intervals, so the UDM and LDAP work which the event loop
+hands off to worker threads is included. The root frame of each stack
+is the name of its thread. Threads which are idle, waiting for work or
+in `select`, are left out.
+"""
+
+import functools
+import logging
+import os
+import random
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Iterable, List, Optional
+
+from .admin import AdminServer, Response, json_response
+
+log = logging.getLogger(__name__)
+
+PROFILE_HEADER = "X-UDM-Profile"
+SUFFIX = ".collapsed"
+
+
+def _frame_name(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({code.co_filename}:{code.co_firstlineno})"
+
+
+# Leaf frames of threads waiting for work, e.g. the event loop in `select`
+# and the idle workers of a thread pool.
+IDLE_FRAMES = {
+    ("selectors.py", "select"),
+    ("threading.py", "wait"),
+    ("queue.py", "get"),
+    ("thread.py", "_worker"),
+}
+
+
+def _is_idle(frame) -> bool:
+    return (os.path.basename(frame.f_code.co_filename), frame.f_code.co_name) in IDLE_FRAMES
+
+
+class SamplingProfiler:
+    """Record the stacks of all threads every `interval` seconds from a sampler thread."""
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def sample(self) -> None:
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        for ident, frame in sys._current_frames().items():
+            if ident == threading.get_ident() or _is_idle(frame):
+                continue
+            stack = []
+            while frame is not None:
+                stack.append(_frame_name(frame))
+                frame = frame.f_back
+            stack.append(names.get(ident, str(ident)))
+            self.stacks[";".join(reversed(stack))] += 1
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self.interval):
+            self.sample()
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> Counter:
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+        return self.stacks
+
+
+class ProfileStore:
+    """Directory of collapsed stack profiles limited to `max_bytes`."""
+
+    def __init__(self, directory: str, max_bytes: int):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+
+    def list(self) -> List[Path]:
+        if not self.directory.is_dir():
+            return []
+        return sorted(self.directory.glob(f"*{SUFFIX}"), key=lambda path: path.stat().st_mtime)
+
+    def get(self, name: str) -> Optional[Path]:
+        if "/" in name or not name.endswith(SUFFIX):
+            return None
+        path = self.directory / name
+        return path if path.is_file() else None
+
+    def write(self, label: str, stacks: Counter) -> Optional[Path]:
+        data = "".join(f"{stack} {count}\n" for stack, count in stacks.most_common()).encode("utf-8")
+        if len(data) > self.max_bytes:
+            log.warning("Discarding profile %s: %d bytes exceed the limit of %d bytes", label, len(data), self.max_bytes)
+            return None
+        self._make_room(len(data))
+        self.directory.mkdir(parents=True, exist_ok=True)
+        label = re.sub(r"[^A-Za-z0-9_.-]+", "_", label).strip("_")[:100]
+        path = self.directory / f"{time.strftime('%Y%m%dT%H%M%S')}-{os.getpid()}-{label}{SUFFIX}"
+        path.write_bytes(data)
+        return path
+
+    def _make_room(self, size: int) -> None:
+        profiles = self.list()
+        used = sum(path.stat().st_size for path in profiles)
+        for path in profiles:
+            if used + size <= self.max_bytes:
+                break
+            used -= path.stat().st_size
+            path.unlink(missing_ok=True)
+
+
+class RequestProfiler:
+    """Decide which requests to profile and store their profiles."""
+
+    def __init__(self, store: ProfileStore, token: str = "", sample_rate: float = 0.0, interval: float = 0.005):
+        self.store = store
+        self.token = token
+        self.sample_rate = sample_rate
+        self.interval = interval
+        self.active = False
+
+    def wants(self, headers) -> bool:
+        if self.active:
+            return False
+        if self.token and headers.get(PROFILE_HEADER) == self.token:
+            return True
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    def patch(self, handler_class) -> None:
+        """Wrap the coroutine `handler_class._execute` which handles a Tornado request."""
+        execute = handler_class._execute
+
+        @functools.wraps(execute)
+        async def _execute(handler, *args, **kwargs):
+            request = handler.request
+            if not self.wants(request.headers):
+                return await execute(handler, *args, **kwargs)
+            self.active = True
+            profiler = SamplingProfiler(self.interval)
+            profiler.start()
+            try:
+                return await execute(handler, *args, **kwargs)
+            finally:
+                stacks = profiler.stop()
+                self.active = False
+                path = self.store.write(f"{request.method}-{request.path}", stacks)
+                if path is not None:
+                    log.info("Profiled %s %s: %s", request.method, request.path, path.name)
+
+        handler_class._execute = _execute
+
+    def routes(self, admin: AdminServer) -> None:
+        admin.route("/profiles/", self._get_profile)
+
+    def _get_profile(self, name: str) -> Response:
+        if not name:
+            return json_response([
+                {"name": path.name, "size": path.stat().st_size} for path in reversed(self.store.list())
+            ])
+        path = self.store.get(name)
+        if path is None:
+            return json_response({"error": "not found"}, 404)
+        return 200, "text/plain; charset=utf-8", path.read_bytes()
+
+
+def install(profiler: RequestProfiler, handler_classes: Optional[Iterable] = None) -> None:
+    """Profile requests handled by Tornado request handlers."""
+    if handler_classes is None:
+        import tornado.web
+        handler_classes = [tornado.web.RequestHandler]
+    for handler_class in handler_classes:
+        profiler.patch(handler_class)
@@ -0,0 +1,321 @@
+# SPDX-License-Identifier: AGPL-3.0-only
+# SPDX-FileCopyrightText: 2026 Univention GmbH
+"""
+Group membership cache shared by all server processes of a pod.
+
+The `groups/group` handler keeps its uniqueMember cache in the memory
+of each process, so every worker resolves the same large groups again.
+This module backs that cache with a SQLite database on the pod-local
+`/tmp` volume. SQLite maps the file into memory and handles the locking
+between the processes. Values are stored as compressed JSON, the least
+recently used entries are evicted when the database exceeds its size
+limit. The total size is kept in a counter row, which triggers update in
+the transaction of each change, and the last use of the entries is
+written in batches instead of on every hit.
+
+Entries are removed when an object is modified, moved or removed
+through UDM, in addition to the expiry after the configured timeout.
+The removal is appended to an invalidation log in the database. Before
+serving an entry of its in-process cache, every process applies the
+invalidations logged since its last check, so no process serves an
+entry removed through another one.
+"""
+
+import functools
+import json
+import logging
+import os
+import sqlite3
+import time
+import zlib
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from . import hooks
+
+log = logging.getLogger(__name__)
+
+MODULE = "univention.admin.handlers.groups.group"
+CACHE = "cache_uniqueMember"
+SIMPLE_LDAP_MODULE = "univention.admin.handlers"
+
+# Write the last use of the entries after this many hits or seconds.
+TOUCH_BATCH = 100
+TOUCH_INTERVAL = 10.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS cache (
+    key TEXT PRIMARY KEY,
+    value BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    created REAL NOT NULL,
+    used REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS usage (id INTEGER PRIMARY KEY CHECK (id = 1), bytes INTEGER NOT NULL);
+INSERT OR IGNORE INTO usage VALUES (1, (SELECT COALESCE(SUM(size), 0) FROM cache));
+CREATE TRIGGER IF NOT EXISTS cache_insert AFTER INSERT ON cache BEGIN
+    UPDATE usage SET bytes = bytes + NEW.size;
+END;
+CREATE TRIGGER IF NOT EXISTS cache_update AFTER UPDATE OF size ON cache BEGIN
+    UPDATE usage SET bytes = bytes + NEW.size - OLD.size;
+END;
+CREATE TRIGGER IF NOT EXISTS cache_delete AFTER DELETE ON cache BEGIN
+    UPDATE usage SET bytes = bytes - OLD.size;
+END;
+CREATE TABLE IF NOT EXISTS invalidations (
+    generation INTEGER PRIMARY KEY AUTOINCREMENT,
+    key TEXT NOT NULL,
+    time REAL NOT NULL
+);
+"""
+
+
+class SharedCache:
+    """Size bounded LRU cache in a SQLite database shared between processes."""
+
+    def __init__(self, path: str, max_bytes: int, ttl: float):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._pid = None
+        self._db: Optional[sqlite3.Connection] = None
+        self._touched: Dict[str, float] = {}
+        self._flushed = time.monotonic()
+        # Called with the removed keys, to remove them from the in-process caches.
+        self.listeners: List[Callable[[Iterable[str]], None]] = []
+
+    @property
+    def db(self) -> sqlite3.Connection:
+        # SQLite connections must not be shared with forked processes.
+        if self._db is None or self._pid != os.getpid():
+            self._db = sqlite3.connect(self.path, timeout=5, isolation_level=None, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=OFF")
+            self._db.execute(f"PRAGMA mmap_size={self.max_bytes * 2}")
+            self._db.executescript(_SCHEMA)
+            self._pid = os.getpid()
+        return self._db
+
+    @staticmethod
+    def _key(key: str) -> str:
+        return key.lower()
+
+    def get(self, key: str) -> Any:
+        entry = self.lookup(key)
+        return None if entry is None else entry[0]
+
+    def lookup(self, key: str) -> Optional[Tuple[Any, float]]:
+        """Return the value of `key` and the time it was stored."""
+        row = self.db.execute(
+            "SELECT value, created FROM cache WHERE key = ? AND created > ?", (self._key(key), time.time() - self.ttl),
+        ).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._touched[self._key(key)] = time.time()
+        if len(self._touched) >= TOUCH_BATCH or time.monotonic() - self._flushed >= TOUCH_INTERVAL:
+            self.flush()
+        return json.loads(zlib.decompress(row[0])), row[1]
+
+    def flush(self) -> None:
+        """Write the last use of the entries read since the previous flush."""
+        touched, self._touched = self._touched, {}
+        self._flushed = time.monotonic()
+        if touched:
+            self.db.executemany(
+                "UPDATE cache SET used = ? WHERE key = ?", [(used, key) for key, used in touched.items()],
+            )
+
+    def set(self, key: str, value: Any) -> None:
+        data = zlib.compress(json.dumps(value, separators=(",", ":"), sort_keys=True).encode("utf-8"))
+        if len(data) > self.max_bytes:
+            return
+        self.flush()
+        now = time.time()
+        # An upsert, as INSERT OR REPLACE would skip the delete trigger of the replaced row.
+        self.db.execute(
+            "INSERT INTO cache (key, value, size, created, used) VALUES (?, ?, ?, ?, ?) ON CONFLICT (key) DO UPDATE"
+            " SET value = excluded.value, size = excluded.size, created = excluded.created, used = excluded.used",
+            (self._key(key), data, len(data), now, now),
+        )
+        self._evict()
+
+    def size(self) -> int:
+        (used,) = self.db.execute("SELECT bytes FROM usage").fetchone()
+        return used
+
+    def delete(self, *keys: str) -> None:
+        """Remove `keys` and log their invalidation for the in-process caches of all processes."""
+        keys = tuple(key for key in keys if key)
+        if not keys:
+            return
+        now = time.time()
+        self.db.execute("BEGIN IMMEDIATE")
+        try:
+            self.db.executemany("DELETE FROM cache WHERE key = ?", [(self._key(key),) for key in keys])
+            self.db.executemany(
+                "INSERT INTO invalidations (key, time) VALUES (?, ?)", [(self._key(key), now) for key in keys],
+            )
+            # In-process entries older than the timeout are expired anyway.
+            self.db.execute("DELETE FROM invalidations WHERE time <= ?", (now - self.ttl,))
+            self.db.execute("COMMIT")
+        except BaseException:
+            self.db.execute("ROLLBACK")
+            raise
+        for listener in self.listeners:
+            listener(keys)
+
+    def invalidations(self, since: Optional[int]) -> Tuple[int, List[str]]:
+        """Return the latest generation of the invalidation log and the keys invalidated after `since`."""
+        if since is None:
+            (generation,) = self.db.execute("SELECT COALESCE(MAX(generation), 0) FROM invalidations").fetchone()
+            return generation, []
+        rows = self.db.execute(
+            "SELECT generation, key FROM invalidations WHERE generation > ? ORDER BY generation", (since,),
+        ).fetchall()
+        return (rows[-1][0] if rows else since), [key for _generation, key in rows]
+
+    def clear(self) -> None:
+        self.db.execute("DELETE FROM cache")
+
+    def _evict(self) -> None:
+        if self.size() <= self.max_bytes:
+            return
+        self.db.execute("DELETE FROM cache WHERE created <= ?", (time.time() - self.ttl,))
+        while self.size() > self.max_bytes:
+            # Evict the least recently used tenth of the entries at once.
+            (count,) = self.db.execute("SELECT COUNT(*) FROM cache").fetchone()
+            evict = max(1, count // 10)
+            self.db.execute(
+                "DELETE FROM cache WHERE key IN (SELECT key FROM cache ORDER BY used LIMIT ?)", (evict,),
+            )
+            self.evictions += evict
+
+
+def patch_cache(shared: SharedCache, cache) -> bool:
+    """Back the in-process `cache` with `shared`, if it has the expected `get` and `set` methods."""
+    get = getattr(cache, "get", None)
+    set_ = getattr(cache, "set", None)
+    if get is None or set_ is None:
+        log.warning("%r has no get() and set(), the shared group cache is disabled", cache)
+        return False
+
+    # Expiry of the in-process entries which were copied from the shared cache, they keep the time
+    # they were stored at, or which were invalidated. They are served again once the handler stores
+    # a new value.
+    valid_until: Dict[str, float] = {}
+    # Generation of the invalidation log applied to `cache`.
+    seen: List[Optional[int]] = [None]
+    remove = next((getattr(cache, name) for name in ("remove", "delete", "invalidate") if hasattr(cache, name)), None)
+
+    def _invalidate(keys: Iterable[str]) -> None:
+        for key in keys:
+            valid_until[shared._key(key)] = 0
+            if remove is not None:
+                try:
+                    remove(key)
+                except KeyError:
+                    pass
+
+    def _sync() -> None:
+        generation, keys = shared.invalidations(seen[0])
+        seen[0] = generation
+        _invalidate(keys)
+
+    shared.listeners.append(_invalidate)
+    try:
+        _sync()
+    except sqlite3.Error:
+        log.exception("Reading the shared group cache failed")
+
+    @functools.wraps(get)
+    def _get(key, *args, **kwargs):
+        try:
+            _sync()
+        except sqlite3.Error:
+            log.exception("Reading the shared group cache failed")
+        value = get(key, *args, **kwargs)
+        if value is not None and valid_until.get(shared._key(key), float("inf")) > time.time():
+            return value
+        try:
+            entry = shared.lookup(key)
+        except sqlite3.Error:
+            log.exception("Reading the shared group cache failed")
+            return None
+        if entry is None:
+            return None
+        value, created = entry
+        set_(key, value)
+        valid_until[shared._key(key)] = created + shared.ttl
+        return value
+
+    @functools.wraps(set_)
+    def _set(key, value, *args, **kwargs):
+        set_(key, value, *args, **kwargs)
+        valid_until.pop(shared._key(key), None)
+        try:
+            shared.set(key, value)
+        except (TypeError, ValueError):
+            log.debug("Value of %s cannot be shared", key)
+        except sqlite3.Error:
+            log.exception("Writing the shared group cache failed")
+
+    cache.get = _get
+    cache.set = _set
+    for name in ("remove", "delete", "invalidate"):
+        method = getattr(cache, name, None)
+        if method is not None:
+            setattr(cache, name, _invalidating(shared, method))
+    return True
+
+
+def _invalidating(shared: SharedCache, remove):
+
+    @functools.wraps(remove)
+    def _remove(key, *args, **kwargs):
+        result = remove(key, *args, **kwargs)
+        try:
+            shared.delete(key)
+        except sqlite3.Error:
+            log.exception("Removing %s from the shared group cache failed", key)
+        return result
+
+    return _remove
+
+
+def patch_modifications(shared: SharedCache, cls) -> None:
+    """Remove the cache entries of objects which are modified, moved or removed through UDM."""
+
+    def _wrap(name: str):
+        method = getattr(cls, name)
+
+        @functools.wraps(method)
+        def _method(obj, *args, **kwargs):
+            old_dn = obj.dn
+            try:
+                return method(obj, *args, **kwargs)
+            finally:
+                try:
+                    shared.delete(old_dn, obj.dn)
+                except sqlite3.Error:
+                    log.exception("Removing %s from the shared group cache failed", old_dn)
+
+        setattr(cls, name, _method)
+
+    for name in ("modify", "move", "remove"):
+        _wrap(name)
+
+
+def install(shared: SharedCache, registry) -> None:
+    """Patch the group handler and UDM objects as soon as the server imports them."""
+    hooks.when_imported(MODULE, lambda module: patch_cache(shared, getattr(module, CACHE)))
+    hooks.when_imported(SIMPLE_LDAP_MODULE, lambda module: patch_modifications(shared, module.simpleLdap))
+    registry.counter("udm_rest_group_cache_hits_total", "Group cache entries read from the shared cache.",
+                     lambda: shared.hits)
+    registry.counter("udm_rest_group_cache_misses_total", "Group cache entries not found in the shared cache.",
+                     lambda: shared.misses)
+    registry.counter("udm_rest_group_cache_evictions_total", "Entries evicted from the shared group cache.",
+                     lambda: shared.evictions)
@@ -0,0 +1,128 @@
+# SPDX-License-Identifier: AGPL-3.0-only
+# SPDX-FileCopyrightText: 2026 Univention GmbH
+"""
+Warm up the UDM REST API before the pod reports readiness.
+
+The first request to a UDM module imports its handler, initializes the
+syntax classes, reads the LDAP schema and opens the LDAP connection of
+the user. A background thread sends these requests to the local server
+as soon as it accepts connections: `/udm/` and the object template of
+every listed module. The admin endpoint answers `/ready` with 503 until
+the warm-up finished, the readiness probe checks it.
+
+Requests are repeated while the server answers with a server error, for
+example while LDAP is not reachable yet. After the timeout the pod is
+reported ready anyway, the readiness probe still fails on HTTP 503.
+"""
+
+import base64
+import logging
+import os
+import threading
+import time
+import urllib.error
+import urllib.request
+from typing import Callable, List, Optional
+
+from .admin import AdminServer, Response, json_response
+
+log = logging.getLogger(__name__)
+
+
+def parse_modules(value: str) -> List[str]:
+    """Parse a comma separated list of UDM modules like `users/user,groups/group`."""
+    return [module.strip().strip("/") for module in value.split(",") if module.strip()]
+
+
+class Warmup:
+    """Send the warm-up requests to the server at `url` in a background thread."""
+
+    def __init__(
+        self, url: str, modules: List[str], authorization: Optional[str] = None, timeout: float = 300,
+        retry_interval: float = 2, clock: Callable[[], float] = time.monotonic,
+    ):
+        self.url = url.rstrip("/")
+        self.modules = modules
+        self.authorization = authorization
+        self.timeout = timeout
+        self.retry_interval = retry_interval
+        self.clock = clock
+        self.duration: Optional[float] = None
+        self.failures = 0
+        self.ready = threading.Event()
+
+    @property
+    def paths(self) -> List[str]:
+        return ["/udm/"] + [f"/udm/{module}/add" for module in self.modules]
+
+    def start(self) -> None:
+        threading.Thread(target=self.run, name="warmup", daemon=True).start()
+
+    def run(self) -> None:
+        started = self.clock()
+        deadline = started + self.timeout
+        try:
+            for path in self.paths:
+                if not self._request(path, deadline):
+                    log.warning("Warm-up timed out after %.0f seconds at %s", self.timeout, path)
+                    break
+        finally:
+            self.duration = self.clock() - started
+            self.ready.set()
+            log.info("Warm-up finished after %.3f seconds", self.duration)
+
+    def _request(self, path: str, deadline: float) -> bool:
+        headers = {"Accept": "application/json"}
+        if self.authorization:
+            headers["Authorization"] = self.authorization
+        while True:
+            try:
+                urllib.request.urlopen(urllib.request.Request(self.url + path, headers=headers), timeout=60).close()
+                return True
+            except urllib.error.HTTPError as exc:
+                if exc.code < 500:
+                    return True
+                log.debug("Warm-up request %s failed: HTTP %d", path, exc.code)
+            except OSError as exc:
+                log.debug("Warm-up request %s failed: %s", path, exc)
+            self.failures += 1
+            if self.clock() + self.retry_interval >= deadline:
+                return False
+            time.sleep(self.retry_interval)
+
+    def routes(self, admin: AdminServer) -> None:
+        admin.route("/ready", self._get_ready)
+
+    def _get_ready(self, path: str) -> Response:
+        if not self.ready.is_set():
+            return json_response({"ready": False}, 503)
+        return json_response({"ready": True, "duration": self.duration})
+
+
+def basic_authorization(user: str, password_file: str) -> str:
+    with open(password_file) as fd:
+        password = fd.read().strip()
+    return "Basic " + base64.b64encode(f"{user}:{password}".encode("ISO8859-1")).decode()
+
+
+def install(warmup: Warmup, admin: AdminServer, registry) -> None:
+    warmup.routes(admin)
+    registry.gauge("udm_rest_warmup_complete", "Whether the warm-up finished.", lambda: int(warmup.ready.is_set()))
+    registry.gauge("udm_rest_warmup_duration_seconds",
+                   "Seconds from the start of the server until the warm-up finished.", lambda: warmup.duration or 0)
+    registry.counter("udm_rest_warmup_retries_total", "Warm-up requests which had to be repeated.",
+                     lambda: warmup.failures)
+    warmup.start()
+
+
+def from_environment(port: int) -> Warmup:
+    authorization = None
+    if os.environ.get("UDM_API_USER") and os.path.exists(os.environ.get("UDM_API_PASSWORD_FILE", "")):
+        authorization = basic_authorization(os.environ["UDM_API_USER"], os.environ["UDM_API_PASSWORD_FILE"])
+    root_path = os.environ.get("UDM_REST_API_ROOT_PATH", "").rstrip("/")
+    return Warmup(
+        f"http://127.0.0.1:{port}{root_path}",
+        parse_modules(os.environ.get("UDM_REST_WARMUP_MODULES", "")),
+        authorization,
+        timeout=float(os.environ.get("UDM_REST_WARMUP_TIMEOUT", "300")),
+    )
@@ -0,0 +1,298 @@
+#!/usr/bin/python3
+# SPDX-License-Identifier: AGPL-3.0-only
+# SPDX-FileCopyrightText: 2026 Univention GmbH
+"""
+Update the UDM license cache only when the licensed objects changed.
+
+`univention-update-license-cache` recounts all licensed objects with
+subtree searches across the whole directory. This check keeps a running
+counter per license object class instead:
+
+- The members of each class are followed with the LDAP content
+  synchronization (RFC 4533) in refresh-only mode. The cookie of the
+  previous run is sent, so the server only reports the entries added to
+  or removed from the class since then, even if runs were missed.
+- The counters and cookies are persisted in a SQLite database in the
+  state directory, together with the counts and the `contextCSN` of the
+  last successful recount.
+- The full recount only runs when a counter differs from the counts of
+  the last recount, or once per reconciliation interval.
+
+If the server does not support the content synchronization, the check
+falls back to comparing the `contextCSN` of the LDAP base with the one
+stored at the last successful recount.
+"""
+
+import argparse
+import json
+import logging
+import os
+import sqlite3
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+UPDATE_LICENSE_CACHE = "/usr/share/univention-directory-manager-tools/univention-update-license-cache"
+
+# The object types counted by the UCS license. The filters may be broader
+# than the license, an extra member only causes an additional recount.
+LICENSE_CLASSES = {
+    "users": "(&(objectClass=univentionPerson)(!(uidNumber=0))(!(uid=*$)))",
+    "servers": "(|(objectClass=univentionDomainController)(objectClass=univentionMemberServer))",
+    "clients": (
+        "(|(objectClass=univentionWindows)(objectClass=univentionMacOSClient)"
+        "(objectClass=univentionUbuntuClient)(objectClass=univentionLinuxClient)"
+        "(objectClass=univentionCorporateClient))"
+    ),
+}
+
+# LDAP result code of e-syncRefreshRequired, the cookie is too old.
+SYNC_REFRESH_REQUIRED = 4096
+
+log = logging.getLogger("app")
+
+
+class LicenseState:
+    """Members, cookies and the last recount per license class in a SQLite database."""
+
+    def __init__(self, path: str):
+        self.db = sqlite3.connect(path, isolation_level=None)
+        self.db.executescript("""
+            CREATE TABLE IF NOT EXISTS members (class TEXT, uuid BLOB, PRIMARY KEY (class, uuid)) WITHOUT ROWID;
+            CREATE TABLE IF NOT EXISTS cookies (class TEXT PRIMARY KEY, cookie TEXT);
+            CREATE TABLE IF NOT EXISTS recount (
+                id INTEGER PRIMARY KEY CHECK (id = 1), counts TEXT, csn TEXT, time REAL
+            );
+            CREATE TEMP TABLE present (uuid BLOB PRIMARY KEY) WITHOUT ROWID;
+        """)
+
+    def counts(self) -> Dict[str, int]:
+        return dict(self.db.execute("SELECT class, COUNT(*) FROM members GROUP BY class"))
+
+    def get_cookie(self, name: str) -> Optional[str]:
+        row = self.db.execute("SELECT cookie FROM cookies WHERE class = ?", (name,)).fetchone()
+        return row[0] if row else None
+
+    def set_cookie(self, name: str, cookie: Optional[str]) -> None:
+        self.db.execute("INSERT OR REPLACE INTO cookies VALUES (?, ?)", (name, cookie))
+
+    def clear(self, name: str) -> None:
+        with self.db:
+            self.db.execute("DELETE FROM members WHERE class = ?", (name,))
+            self.db.execute("DELETE FROM cookies WHERE class = ?", (name,))
+
+    def last_recount(self) -> Optional[Dict]:
+        row = self.db.execute("SELECT counts, csn, time FROM recount").fetchone()
+        if row is None:
+            return None
+        return {"counts": json.loads(row[0]), "csn": row[1], "time": row[2]}
+
+    def set_recount(self, counts: Dict[str, int], csn: Optional[str], now: float) -> None:
+        self.db.execute("INSERT OR REPLACE INTO recount VALUES (1, ?, ?, ?)", (json.dumps(counts), csn, now))
+
+
+class ClassSync:
+    """Apply the content synchronization messages of one license class to the state."""
+
+    def __init__(self, state: LicenseState, name: str):
+        self.state = state
+        self.name = name
+        self.db = state.db
+        self.db.execute("DELETE FROM present")
+        self.db.execute("BEGIN")
+
+    def entry(self, uuid: bytes) -> None:
+        self.db.execute("INSERT OR IGNORE INTO members VALUES (?, ?)", (self.name, uuid))
+        self.db.execute("INSERT OR IGNORE INTO present VALUES (?)", (uuid,))
+
+    def delete(self, uuids: Iterable[bytes]) -> None:
+        self.db.executemany("DELETE FROM members WHERE class = ? AND uuid = ?", ((self.name, uuid) for uuid in uuids))
+
+    def present(self, uuids: Optional[Iterable[bytes]], refresh_deletes: bool = False) -> None:
+        if uuids is not None:
+            if refresh_deletes:
+                self.delete(uuids)
+            else:
+                self.db.executemany("INSERT OR IGNORE INTO present VALUES (?)", ((uuid,) for uuid in uuids))
+            return
+        if not refresh_deletes:
+            # End of the present phase: all members which were not presented are gone.
+            self.db.execute(
+                "DELETE FROM members WHERE class = ? AND uuid NOT IN (SELECT uuid FROM present)", (self.name,),
+            )
+        self.db.execute("DELETE FROM present")
+
+    def commit(self, cookie: Optional[str]) -> None:
+        self.state.set_cookie(self.name, cookie)
+        self.db.execute("COMMIT")
+
+    def rollback(self) -> None:
+        self.db.execute("ROLLBACK")
+
+
+def count_changes(counts: Dict[str, int], recount: Optional[Dict]) -> Optional[str]:
+    """Describe how `counts` differ from the counts of the last recount."""
+    if recount is None:
+        return "no recount was recorded yet"
+    previous = recount["counts"]
+    changes = [
+        f"{name} {previous.get(name, 0)} -> {counts.get(name, 0)}"
+        for name in sorted(set(counts) | set(previous))
+        if counts.get(name, 0) != previous.get(name, 0)
+    ]
+    return f"licensed objects changed: {', '.join(changes)}" if changes else None
+
+
+def recount_reason(
+    now: float, recount: Optional[Dict], reconcile_interval: int, counts: Optional[Dict[str, int]] = None,
+    csn: Optional[str] = None,
+) -> Optional[str]:
+    """Return why a full recount is needed, `counts` is None if the content synchronization is unavailable."""
+    if recount is None:
+        return "no recount was recorded yet"
+    if now - recount["time"] >= reconcile_interval:
+        return "periodic reconciliation"
+    if counts is not None:
+        return count_changes(counts, recount)
+    if csn is None:
+        return "the LDAP base has no contextCSN"
+    if csn != recount["csn"]:
+        return f"the contextCSN changed since the last recount: {csn}"
+    return None
+
+
+def read_context_csn(lo, base: str) -> Optional[str]:
+    result = lo.search(base=base, scope="base", attr=["contextCSN"])
+    values = sorted(value.decode("ASCII") for value in (result[0][1].get("contextCSN", []) if result else []))
+    return ";".join(values) or None
+
+
+def start_tls(conn, mode: int) -> None:
+    """Apply the `start_tls` setting of `univention.uldap.access`: 2 requires StartTLS, 1 tries it."""
+    if not mode:
+        return
+    import ldap
+
+    try:
+        conn.start_tls_s()
+    except ldap.LDAPError as exc:
+        if mode == 2:
+            raise
+        log.warning("StartTLS failed, continuing without TLS: %s", exc)
+
+
+def synchronize(lo, state: LicenseState, base: str, classes: Dict[str, str]) -> Dict[str, int]:
+    """Update the members of all license classes, return the counts."""
+    import ldap
+    import ldap.ldapobject
+    from ldap.syncrepl import SyncreplConsumer
+
+    class Consumer(SyncreplConsumer, ldap.ldapobject.SimpleLDAPObject):
+
+        def syncrepl_get_cookie(self):
+            return self.cookie
+
+        def syncrepl_set_cookie(self, cookie):
+            self.cookie = cookie
+
+        def syncrepl_entry(self, dn, attributes, uuid):
+            self.sync.entry(uuid)
+
+        def syncrepl_delete(self, uuids):
+            self.sync.delete(uuids)
+
+        def syncrepl_present(self, uuids, refreshDeletes=False):
+            self.sync.present(uuids, refreshDeletes)
+
+        def syncrepl_refreshdone(self):
+            pass
+
+    # A separate connection with the credentials of the `univention.uldap.access` `lo`.
+    consumer = Consumer(getattr(lo, "uri", None) or f"ldap://{lo.host}:{lo.port}")
+    consumer.set_option(ldap.OPT_NETWORK_TIMEOUT, 30)
+    start_tls(consumer, int(lo.start_tls or 0))
+    consumer.simple_bind_s(lo.binddn, lo.bindpw)
+    try:
+        for name, filter in classes.items():
+            for _attempt in range(2):
+                consumer.cookie = state.get_cookie(name)
+                if consumer.cookie is None:
+                    state.clear(name)
+                consumer.sync = ClassSync(state, name)
+                try:
+                    msgid = consumer.syncrepl_search(base, ldap.SCOPE_SUBTREE, mode="refreshOnly",
+                                                     filterstr=filter, attrlist=["1.1"])
+                    while consumer.syncrepl_poll(msgid=msgid, all=1):
+                        pass
+                except ldap.LDAPError as exc:
+                    consumer.sync.rollback()
+                    if exc.args and exc.args[0].get("result") == SYNC_REFRESH_REQUIRED:
+                        log.info("The synchronization cookie of %s expired, refreshing", name)
+                        state.set_cookie(name, None)
+                        continue
+                    raise
+                consumer.sync.commit(consumer.cookie)
+                break
+    finally:
+        consumer.unbind_s()
+    counts = state.counts()
+    return {name: counts.get(name, 0) for name in classes}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--reconcile-interval",
+        type=int,
+        default=int(os.environ.get("LICENSE_CACHE_RECONCILE_INTERVAL", "86400")),
+        help="seconds between two unconditional recounts (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--state-dir",
+        default=os.environ.get("LICENSE_CACHE_STATE_DIR", "/var/lib/univention-license-cache"),
+        help="directory of the persisted counters (default: %(default)s)",
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+        level=os.environ.get("LOG_LEVEL", "INFO").upper())
+
+    import ldap
+    from univention.config_registry import ucr
+    from univention.uldap import getAdminConnection
+
+    Path(args.state_dir).mkdir(parents=True, exist_ok=True)
+    state = LicenseState(os.path.join(args.state_dir, "license-counters.sqlite"))
+    lo = getAdminConnection()
+    base = ucr["ldap/base"]
+
+    # Read before the recount, changes during the recount are detected by the next run.
+    csn = read_context_csn(lo, base)
+    try:
+        counts = synchronize(lo, state, base, LICENSE_CLASSES)
+        log.info("Licensed objects: %s", ", ".join(f"{name} {count}" for name, count in counts.items()))
+    except ldap.LDAPError as exc:
+        log.warning("The content synchronization failed, comparing the contextCSN instead: %s", exc)
+        counts = None
+
+    now = time.time()
+    reason = recount_reason(now, state.last_recount(), args.reconcile_interval, counts, csn)
+    if reason is None:
+        log.info("The licensed objects did not change since the last recount, the license cache is up to date")
+        return 0
+
+    log.info("Updating the license cache: %s", reason)
+    sys.stdout.flush()
+    returncode = subprocess.run([UPDATE_LICENSE_CACHE]).returncode
+    if returncode:
+        log.error("%s failed with exit code %d", UPDATE_LICENSE_CACHE, returncode)
+        return returncode
+    state.set_recount(counts if counts is not None else state.counts(), csn, now)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
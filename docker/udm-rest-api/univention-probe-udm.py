@@ -24,12 +24,24 @@ def main() -> int:
         default=9979,
         help="port the UDM REST API listens on (default: %(default)s)",
     )
+    parser.add_argument(
+        "--admin-port",
+        type=int,
+        default=int(os.environ.get("UDM_REST_ADMIN_PORT", "9980")),
+        help="port of the admin endpoint which reports the end of the warm-up (default: %(default)s)",
+    )
     args = parser.parse_args()
     with open(os.environ["UDM_API_PASSWORD_FILE"]) as fd:
         password = fd.read().strip()
     credentials = f'{os.environ["UDM_API_USER"]}:{password}'
     auth = base64.b64encode(credentials.encode("ISO8859-1")).decode()
     root_path = os.environ.get("UDM_REST_API_ROOT_PATH", "").rstrip("/")
+    if args.check == "ready":
+        try:
+            urllib.request.urlopen(f"http://127.0.0.1:{args.admin_port}/ready", timeout=3)
+        except OSError as exc:
+            print(f"warm-up not finished: {exc}", file=sys.stderr)
+            return 1
     request = urllib.request.Request(
         f"http://127.0.0.1:{args.port}{root_path}/udm/",
         headers={"Authorization": f"Basic {auth}", "Accept": "application/json"},
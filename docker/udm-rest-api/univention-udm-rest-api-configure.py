@@ -0,0 +1,15 @@
+#!/usr/bin/python3
+# SPDX-License-Identifier: AGPL-3.0-only
+# SPDX-FileCopyrightText: 2026 Univention GmbH
+"""
+Prepare LDAP client configuration, directory reports and secrets of the container.
+"""
+
+import sys
+
+sys.path.insert(0, "/usr/local/lib/udm-rest-api")
+
+from udm_rest_api_container.configure import main  # noqa: E402
+
+if __name__ == "__main__":
+    sys.exit(main())
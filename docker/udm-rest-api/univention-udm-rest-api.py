@@ -0,0 +1,99 @@
+#!/usr/bin/python3
+# SPDX-License-Identifier: AGPL-3.0-only
+# SPDX-FileCopyrightText: 2026 Univention GmbH
+"""
+Start the UDM REST API with the container runtime extensions.
+
+All command line arguments are passed on to `univention.admin.rest.server`.
+"""
+
+import argparse
+import os
+import runpy
+import sys
+
+sys.path.insert(0, "/usr/local/lib/udm-rest-api")
+
+from udm_rest_api_container import authcache, bulkdelete, logqueue, metrics, profiling, sharedcache, warmup  # noqa: E402
+from udm_rest_api_container.admin import AdminServer  # noqa: E402
+from udm_rest_api_container.metrics import registry  # noqa: E402
+
+
+def _get_bool(key: str) -> bool:
+    return os.environ.get(key, "false").lower() in ("1", "true", "yes")
+
+
+def _server_port() -> int:
+    parser = argparse.ArgumentParser(add_help=False)
+    parser.add_argument("--port", type=int, default=9979)
+    return parser.parse_known_args()[0].port
+
+
+def main() -> None:
+    log_queue = logqueue.install(
+        int(os.environ.get("UDM_REST_LOG_QUEUE_SIZE", "10000")),
+        logqueue.parse_sampling(os.environ.get("UDM_REST_LOG_SAMPLING", "")),
+    )
+    if log_queue is not None:
+        registry.counter("udm_rest_log_records_dropped_total", "Log records dropped on queue overflow.",
+                         lambda: log_queue.dropped)
+
+    admin = AdminServer(
+        os.environ.get("UDM_REST_ADMIN_ADDRESS", "127.0.0.1"),
+        int(os.environ.get("UDM_REST_ADMIN_PORT", "9980")),
+    )
+    registry.routes(admin)
+    metrics.install(metrics.RequestCounter(), registry)
+
+    # The metrics are additionally served on all interfaces for Prometheus,
+    # without the other operator resources of the admin endpoint.
+    metrics_port = int(os.environ.get("UDM_REST_METRICS_PORT", "0"))
+    if metrics_port:
+        metrics_server = AdminServer("0.0.0.0", metrics_port)
+        registry.routes(metrics_server)
+        metrics_server.start()
+
+    from univention.config_registry import ucr
+
+    authz_cache_ttl = float(os.environ.get("UDM_REST_AUTHZ_CACHE_TTL", "60"))
+    if authz_cache_ttl > 0:
+        authcache.install(authcache.AuthorizationCache(
+            authz_cache_ttl,
+            negative_ttl=float(os.environ.get("UDM_REST_AUTHZ_CACHE_NEGATIVE_TTL", "0")),
+            max_entries=int(os.environ.get("UDM_REST_AUTHZ_CACHE_MAX_ENTRIES", "10000")),
+            fingerprint=authcache.group_fingerprint(authcache.authorized_groups(ucr)),
+            check_interval=float(os.environ.get("UDM_REST_AUTHZ_CACHE_CHECK_INTERVAL", "10")),
+        ), registry)
+
+    group_cache = os.environ.get("UDM_REST_GROUP_CACHE", "")
+    if group_cache:
+        sharedcache.install(sharedcache.SharedCache(
+            group_cache,
+            int(os.environ.get("UDM_REST_GROUP_CACHE_MAX_BYTES", str(64 * 1024 * 1024))),
+            ucr.get_int("directory/manager/web/modules/groups/group/caching/uniqueMember/timeout", 300),
+        ), registry)
+
+    if _get_bool("UDM_REST_PROFILING_ENABLED"):
+        profiler = profiling.RequestProfiler(
+            profiling.ProfileStore(
+                os.environ.get("UDM_REST_PROFILING_DIR", "/tmp/udm-rest-api-profiles"),
+                int(os.environ.get("UDM_REST_PROFILING_MAX_BYTES", str(50 * 1024 * 1024))),
+            ),
+            token=os.environ.get("UDM_REST_PROFILING_TOKEN", ""),
+            sample_rate=float(os.environ.get("UDM_REST_PROFILING_SAMPLE_RATE", "0")),
+            interval=float(os.environ.get("UDM_REST_PROFILING_INTERVAL", "0.005")),
+        )
+        profiling.install(profiler)
+        profiler.routes(admin)
+
+    if _get_bool("UDM_REST_BULK_DELETE_ENABLED"):
+        bulkdelete.install(bulkdelete.from_environment(), registry)
+
+    warmup.install(warmup.from_environment(_server_port()), admin, registry)
+    admin.start()
+
+    runpy.run_module("univention.admin.rest.server", run_name="__main__", alter_sys=True)
+
+
+if __name__ == "__main__":
+    main()
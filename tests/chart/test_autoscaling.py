@@ -0,0 +1,154 @@
+# SPDX-License-Identifier: AGPL-3.0-only
+# SPDX-FileCopyrightText: 2026 Univention GmbH
+
+import subprocess
+
+import pytest
+from pytest_helm.utils import load_yaml
+from univention.testing.helm.base import Base
+
+
+class TestHorizontalPodAutoscaler(Base):
+    template_name = 'templates/hpa.yaml'
+
+    def test_scales_on_cpu(self, helm, chart_default_path):
+        values = load_yaml(
+            """
+            autoscaling:
+              enabled: true
+              minReplicas: 2
+              maxReplicas: 5
+              targetCPUUtilizationPercentage: 60
+            resources:
+              requests:
+                cpu: "500m"
+            """,
+        )
+
+        hpa = self.helm_template_file(helm, chart_default_path, values, self.template_name)
+
+        assert hpa['kind'] == 'HorizontalPodAutoscaler'
+        assert hpa['spec']['scaleTargetRef']['kind'] == 'Deployment'
+        assert hpa['spec']['scaleTargetRef']['name'] == 'release-name-udm-rest-api'
+        assert hpa['spec']['minReplicas'] == 2
+        assert hpa['spec']['maxReplicas'] == 5
+        assert hpa['spec']['metrics'] == [{
+            'type': 'Resource',
+            'resource': {'name': 'cpu', 'target': {'type': 'Utilization', 'averageUtilization': 60}},
+        }]
+
+    def test_cpu_utilization_requires_cpu_requests(self, helm, chart_default_path):
+        values = load_yaml(
+            """
+            autoscaling:
+              enabled: true
+              targetCPUUtilizationPercentage: 60
+            resources: {}
+            """,
+        )
+
+        with pytest.raises(subprocess.CalledProcessError):
+            self.helm_template_file(helm, chart_default_path, values, self.template_name)
+
+    def test_scales_on_requests_in_flight(self, helm, chart_default_path):
+        values = load_yaml(
+            """
+            metrics:
+              enabled: true
+            autoscaling:
+              enabled: true
+              targetCPUUtilizationPercentage: 0
+              targetRequestsInFlight: 4
+            """,
+        )
+
+        hpa = self.helm_template_file(helm, chart_default_path, values, self.template_name)
+
+        assert hpa['spec']['metrics'] == [{
+            'type': 'Pods',
+            'pods': {
+                'metric': {'name': 'udm_rest_requests_in_flight'},
+                'target': {'type': 'AverageValue', 'averageValue': '4'},
+            },
+        }]
+
+    def test_deployment_replicas_are_left_to_the_autoscaler(self, helm, chart_default_path):
+        values = load_yaml(
+            """
+            replicaCount: 3
+            autoscaling:
+              enabled: true
+            resources:
+              requests:
+                cpu: "500m"
+            """,
+        )
+
+        deployment = self.helm_template_file(helm, chart_default_path, values, 'templates/deployment.yaml')
+
+        assert 'replicas' not in deployment['spec']
+
+    def test_deployment_replicas_without_autoscaler(self, helm, chart_default_path):
+        values = load_yaml(
+            """
+            replicaCount: 3
+            """,
+        )
+
+        deployment = self.helm_template_file(helm, chart_default_path, values, 'templates/deployment.yaml')
+
+        assert deployment['spec']['replicas'] == 3
+
+
+class TestPodDisruptionBudget(Base):
+    template_name = 'templates/pdb.yaml'
+
+    def test_min_available(self, helm, chart_default_path):
+        values = load_yaml(
+            """
+            podDisruptionBudget:
+              enabled: true
+              minAvailable: 2
+            """,
+        )
+
+        pdb = self.helm_template_file(helm, chart_default_path, values, self.template_name)
+
+        assert pdb['kind'] == 'PodDisruptionBudget'
+        assert pdb['spec']['minAvailable'] == 2
+        assert 'maxUnavailable' not in pdb['spec']
+        assert pdb['spec']['selector']['matchLabels']['app.kubernetes.io/component'] == 'server'
+
+    def test_max_unavailable(self, helm, chart_default_path):
+        values = load_yaml(
+            """
+            podDisruptionBudget:
+              enabled: true
+              maxUnavailable: "25%"
+            """,
+        )
+
+        pdb = self.helm_template_file(helm, chart_default_path, values, self.template_name)
+
+        assert pdb['spec']['maxUnavailable'] == '25%'
+        assert 'minAvailable' not in pdb['spec']
+
+
+class TestMetrics(Base):
+    template_name = 'templates/deployment.yaml'
+
+    def test_metrics_port_and_annotations(self, helm, chart_default_path):
+        values = load_yaml(
+            """
+            metrics:
+              enabled: true
+              port: 9981
+            """,
+        )
+
+        deployment = self.helm_template_file(helm, chart_default_path, values, self.template_name)
+
+        pod = deployment['spec']['template']
+        assert pod['metadata']['annotations']['prometheus.io/port'] == '9981'
+        main = next(container for container in pod['spec']['containers'] if container['name'] == 'main')
+        assert {'name': 'metrics', 'containerPort': 9981, 'protocol': 'TCP'} in main['ports']
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+# SPDX-License-Identifier: AGPL-3.0-only
+# SPDX-FileCopyrightText: 2026 Univention GmbH
+"""
+Generate a synthetic large directory for the scale tests of the maintenance jobs.
+
+Writes LDIF files for `slapadd` into the output directory:
+
+- `main.ldif`: users and groups below `cn=scale,<base DN>`,
+  a share of them without `univentionObjectIdentifier`.
+- `internal.ldif`: blocklists below `cn=blocklists,cn=internal`
+  with entries, a share of them expired.
+- `manifest.json`: the parameters, the expected counts and sample DNs
+  used by `tests/integration/test_scale_maintenance_jobs.py`.
+
+The output is deterministic for a given `--seed`.
+"""
+
+import argparse
+import json
+import random
+import uuid
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, Iterator, List, TextIO, Tuple
+
+BLOCKLISTS_DN = "cn=blocklists,cn=internal"
+SAMPLES = 10
+
+Entry = Tuple[str, List[Tuple[str, str]]]
+
+
+def write_entry(fd: TextIO, dn: str, attributes: List[Tuple[str, str]]) -> None:
+    fd.write(f"dn: {dn}\n")
+    for key, value in attributes:
+        fd.write(f"{key}: {value}\n")
+    fd.write("\n")
+
+
+class Generator:
+
+    def __init__(self, args: argparse.Namespace):
+        self.args = args
+        self.random = random.Random(args.seed)
+        self.base = f"cn=scale,{args.base_dn}"
+        self.users_dn = f"cn=users,{self.base}"
+        self.groups_dn = f"cn=groups,{self.base}"
+        self.now = datetime.now(timezone.utc)
+        self.manifest: Dict = {
+            "base_dn": self.base,
+            "parameters": {key: value for key, value in vars(args).items() if key != "output_dir"},
+            "users": 0,
+            "groups": 0,
+            "without_identifier": 0,
+            "blocklists": 0,
+            "blocklist_entries": 0,
+            "expired_entries": 0,
+            "samples": {"without_identifier": [], "expired": [], "valid": []},
+        }
+
+    def uuid(self) -> str:
+        return str(uuid.UUID(int=self.random.getrandbits(128), version=4))
+
+    def _sample(self, kind: str, dn: str) -> None:
+        samples = self.manifest["samples"][kind]
+        if len(samples) < SAMPLES:
+            samples.append(dn)
+
+    def _object(self, dn: str, object_type: str) -> List[Tuple[str, str]]:
+        attributes = [("objectClass", "univentionObject"), ("univentionObjectType", object_type)]
+        if self.random.random() < self.args.without_identifier:
+            self.manifest["without_identifier"] += 1
+            self._sample("without_identifier", dn)
+        else:
+            attributes.append(("univentionObjectIdentifier", self.uuid()))
+        return attributes
+
+    def _container(self, dn: str) -> Entry:
+        return dn, [
+            ("objectClass", "top"),
+            ("objectClass", "organizationalRole"),
+            ("objectClass", "univentionObject"),
+            ("univentionObjectType", "container/cn"),
+            ("univentionObjectIdentifier", self.uuid()),
+            ("cn", dn.split(",", 1)[0].split("=", 1)[1]),
+        ]
+
+    def main_entries(self) -> Iterator[Entry]:
+        for dn in (self.base, self.users_dn, self.groups_dn):
+            yield self._container(dn)
+        for i in range(self.args.users):
+            uid = f"scale-user-{i}"
+            dn = f"uid={uid},{self.users_dn}"
+            yield dn, [
+                ("objectClass", "top"),
+                ("objectClass", "person"),
+                ("objectClass", "organizationalPerson"),
+                ("objectClass", "inetOrgPerson"),
+                ("objectClass", "posixAccount"),
+                ("objectClass", "shadowAccount"),
+                *self._object(dn, "users/user"),
+                ("uid", uid),
+                ("cn", f"Scale User {i}"),
+                ("givenName", "Scale"),
+                ("sn", f"User {i}"),
+                ("uidNumber", str(100000 + i)),
+                ("gidNumber", "5001"),
+                ("homeDirectory", f"/home/{uid}"),
+                ("loginShell", "/bin/bash"),
+            ]
+            self.manifest["users"] += 1
+        for i in range(self.args.groups):
+            name = f"scale-group-{i}"
+            dn = f"cn={name},{self.groups_dn}"
+            members = self.random.sample(range(self.args.users), min(self.args.members, self.args.users))
+            yield dn, [
+                ("objectClass", "top"),
+                ("objectClass", "posixGroup"),
+                ("objectClass", "univentionGroup"),
+                *self._object(dn, "groups/group"),
+                ("cn", name),
+                ("gidNumber", str(100000 + i)),
+                *[("uniqueMember", f"uid=scale-user-{member},{self.users_dn}") for member in sorted(members)],
+                *[("memberUid", f"scale-user-{member}") for member in sorted(members)],
+            ]
+            self.manifest["groups"] += 1
+
+    def internal_entries(self) -> Iterator[Entry]:
+        for i in range(self.args.blocklists):
+            name = f"scale-blocklist-{i}"
+            list_dn = f"cn={name},{BLOCKLISTS_DN}"
+            yield list_dn, [
+                ("objectClass", "top"),
+                ("objectClass", "univentionBlocklist"),
+                ("objectClass", "univentionObject"),
+                ("univentionObjectType", "blocklists/list"),
+                ("univentionObjectIdentifier", self.uuid()),
+                ("cn", name),
+                ("univentionBlocklistRetentionTime", "1d"),
+                ("univentionBlockingProperties", "users/user mailPrimaryAddress"),
+            ]
+            self.manifest["blocklists"] += 1
+            for _ in range(self.args.entries):
+                value = f"sha256:{self.random.getrandbits(256):064x}"
+                dn = f"cn={value},{list_dn}"
+                if self.random.random() < self.args.expired:
+                    blocked_until = self.now - timedelta(days=1 + self.random.randrange(30))
+                    self.manifest["expired_entries"] += 1
+                    self._sample("expired", dn)
+                else:
+                    blocked_until = self.now + timedelta(days=1 + self.random.randrange(30))
+                    self._sample("valid", dn)
+                yield dn, [
+                    ("objectClass", "top"),
+                    ("objectClass", "univentionBlockingEntry"),
+                    ("objectClass", "univentionObject"),
+                    ("univentionObjectType", "blocklists/entry"),
+                    ("univentionObjectIdentifier", self.uuid()),
+                    ("cn", value),
+                    ("univentionBlockedUntil", blocked_until.strftime("%Y%m%d%H%M%SZ")),
+                    ("univentionBlockingEntryOriginUniventionObjectIdentifier", self.uuid()),
+                ]
+                self.manifest["blocklist_entries"] += 1
+
+    def write(self, output_dir: Path) -> Dict:
+        output_dir.mkdir(parents=True, exist_ok=True)
+        for name, entries in (("main.ldif", self.main_entries()), ("internal.ldif", self.internal_entries())):
+            with (output_dir / name).open("w") as fd:
+                for dn, attributes in entries:
+                    write_entry(fd, dn, attributes)
+        (output_dir / "manifest.json").write_text(json.dumps(self.manifest, indent=2) + "\n")
+        return self.manifest
+
+
+def share(value: str) -> float:
+    result = float(value)
+    if not 0 <= result <= 1:
+        raise argparse.ArgumentTypeError(f"{value} is not between 0 and 1")
+    return result
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--output-dir", type=Path, default=Path(__file__).parent / "scale-data",
+                        help="directory for the LDIF files and the manifest (default: %(default)s)")
+    parser.add_argument("--base-dn", default="dc=univention-organization,dc=intranet",
+                        help="LDAP base DN (default: %(default)s)")
+    parser.add_argument("--users", type=int, default=100000, help="number of users (default: %(default)s)")
+    parser.add_argument("--groups", type=int, default=1000, help="number of groups (default: %(default)s)")
+    parser.add_argument("--members", type=int, default=100,
+                        help="number of users per group (default: %(default)s)")
+    parser.add_argument("--blocklists", type=int, default=10, help="number of blocklists (default: %(default)s)")
+    parser.add_argument("--entries", type=int, default=10000,
+                        help="number of entries per blocklist (default: %(default)s)")
+    parser.add_argument("--expired", type=share, default=0.5,
+                        help="share of expired blocklist entries (default: %(default)s)")
+    parser.add_argument("--without-identifier", type=share, default=0.2,
+                        help="share of users and groups without univentionObjectIdentifier (default: %(default)s)")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the random generator (default: %(default)s)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> None:
+    args = parse_args(argv)
+    manifest = Generator(args).write(args.output_dir)
+    print(json.dumps({key: value for key, value in manifest.items() if key not in ("parameters", "samples")}))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,18 @@
+#!/bin/bash
+# Load the synthetic directory written by tests/generate-scale-ldif.py
+# into the databases of the LDAP server, once per volume.
+
+set -euo pipefail
+data=/scale-data
+marker=/var/lib/univention-ldap/scale-data-loaded
+
+if [ ! -e "$data/manifest.json" ] || [ -e "$marker" ]; then
+  exit 0
+fi
+
+echo "Loading the scale test data from $data"
+slapadd -q -b "$LDAP_BASEDN" -f /etc/ldap/slapd.conf -l "$data/main.ldif"
+slapadd -q -b cn=internal -f /etc/ldap/slapd.conf -l "$data/internal.ldif"
+cp "$data/manifest.json" "$marker"
+
+exit 0
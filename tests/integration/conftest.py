@@ -43,6 +43,18 @@ def pytest_addoption(parser: pytest.Parser):
         default="univention",
         help="Password to authenticate with the UDM REST API.",
     )
+    parser.addoption(
+        "--ldap-uri",
+        action="store",
+        default="ldap://localhost:389",
+        help="LDAP server for the tests which access it directly.",
+    )
+    parser.addoption(
+        "--scale-data",
+        action="store",
+        default="tests/scale-data",
+        help="Output directory of tests/generate-scale-ldif.py which was loaded into the LDAP server.",
+    )
 
 
 @pytest.fixture(scope="session")
@@ -0,0 +1,127 @@
+# SPDX-License-Identifier: AGPL-3.0-only
+# SPDX-FileCopyrightText: 2026 Univention GmbH
+"""
+Scale tests of the maintenance jobs against a synthetic large directory.
+
+They are skipped unless the output of `tests/generate-scale-ldif.py` was
+loaded into the LDAP server, see `tests/README.md`. Wall time, peak RSS
+and operations per second of every job are recorded as test properties
+and appended to `results.jsonl` in the scale data directory.
+"""
+
+import json
+import os
+import shutil
+import subprocess
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List
+
+import pytest
+from univention.admin.rest.client import UnprocessableEntity
+
+JOBS = Path("docker")
+MISSING_IDENTIFIER = "(&(objectClass=univentionObject)(!(univentionObjectIdentifier=*)))"
+
+
+@pytest.fixture(scope="module")
+def scale_data(pytestconfig) -> Path:
+    path = Path(pytestconfig.getoption("--scale-data"))
+    if not (path / "manifest.json").exists():
+        pytest.skip(f"no scale data in {path}, see tests/README.md")
+    return path
+
+
+@pytest.fixture(scope="module")
+def manifest(scale_data) -> Dict:
+    return json.loads((scale_data / "manifest.json").read_text())
+
+
+@pytest.fixture
+def measure(scale_data, record_property):
+
+    def _measure(name: str, command: List[str], env: Dict[str, str], operations: int) -> Dict:
+        started = time.monotonic()
+        process = subprocess.Popen(command, env=os.environ | env)
+        _pid, status, rusage = os.wait4(process.pid, 0)
+        process.returncode = os.waitstatus_to_exitcode(status)
+        wall_time = time.monotonic() - started
+        assert process.returncode == 0, f"{name} failed with exit code {process.returncode}"
+
+        result = {
+            "job": name,
+            "operations": operations,
+            "wall_time": round(wall_time, 3),
+            "peak_rss": rusage.ru_maxrss * 1024,
+            "operations_per_second": round(operations / wall_time, 1),
+        }
+        for key, value in result.items():
+            record_property(key, value)
+        with (scale_data / "results.jsonl").open("a") as fd:
+            fd.write(json.dumps(result) + "\n")
+        print(result)
+        return result
+
+    return _measure
+
+
+def test_update_univention_object_identifier(manifest, measure, pytestconfig, base_dn):
+    ldap = pytest.importorskip("ldap")
+    connection = ldap.initialize(pytestconfig.getoption("--ldap-uri"))
+    connection.simple_bind_s(f"cn=admin,{base_dn}", pytestconfig.getoption("--password"))
+
+    def missing() -> int:
+        return len(connection.search_s(manifest["base_dn"], ldap.SCOPE_SUBTREE, MISSING_IDENTIFIER, ["1.1"]))
+
+    operations = missing()
+    if not operations:
+        pytest.skip("the scale data was already processed, recreate the LDAP volume")
+
+    measure(
+        "ldap-update-univention-object-identifier",
+        [
+            shutil.which("python3"),
+            JOBS / "ldap-update-univention-object-identifier" / "ldap-update-univention-object-identifier.py",
+        ],
+        {
+            "LDAP_URI": pytestconfig.getoption("--ldap-uri"),
+            "LDAP_ADMIN_USER": f"cn=admin,{base_dn}",
+            "LDAP_ADMIN_PASSWORD": pytestconfig.getoption("--password"),
+            "LDAP_BASE_DN": manifest["base_dn"],
+            "PYTHON_LOG_LEVEL": "WARNING",
+        },
+        operations,
+    )
+
+    assert missing() == 0
+
+
+def test_blocklist_cleanup(manifest, measure, udm_rest_api_client, udm_url, pytestconfig):
+    entries = udm_rest_api_client.get("blocklists/entry")
+    samples = manifest["samples"]
+    try:
+        for dn in samples["expired"]:
+            entries.get(dn)
+    except UnprocessableEntity:
+        pytest.skip("the scale data was already processed, recreate the LDAP volume")
+
+    with tempfile.NamedTemporaryFile() as fd:
+        fd.write(pytestconfig.getoption("--password").encode("UTF-8"))
+        fd.flush()
+        measure(
+            "blocklist-cleanup",
+            [shutil.which("python3"), JOBS / "blocklist-cleanup" / "blocklist_clean_expired.py"],
+            {
+                "UDM_API_URL": udm_url,
+                "UDM_API_USER": pytestconfig.getoption("--username"),
+                "UDM_API_PASSWORD_FILE": fd.name,
+            },
+            manifest["expired_entries"],
+        )
+
+    for dn in samples["expired"]:
+        with pytest.raises(UnprocessableEntity):
+            entries.get(dn)
+    for dn in samples["valid"]:
+        assert entries.get(dn)
@@ -0,0 +1,30 @@
+#!/bin/bash
+# SPDX-License-Identifier: AGPL-3.0-only
+# SPDX-FileCopyrightText: 2026 Univention GmbH
+#
+# Measure the time from starting the udm-rest-api container of docker compose
+# until the server answers on /udm/, and the time of its configuration step.
+# The image is selected with $IMAGE_TAG like for docker compose.
+# Usage: tests/measure-startup.sh [runs]
+
+set -euo pipefail
+runs=${1:-5}
+url=${UDM_REST_URL:-http://localhost:9979/udm/}
+times=()
+
+for _ in $(seq "$runs"); do
+  docker compose rm --force --stop udm-rest-api >/dev/null 2>&1
+  start=$(date +%s.%N)
+  docker compose up --detach --no-deps --no-build udm-rest-api >/dev/null 2>&1
+  until curl --silent --output /dev/null "$url"; do
+    sleep 0.05
+  done
+  end=$(date +%s.%N)
+  configured=$(docker compose logs udm-rest-api | grep -o "Configured the container in [0-9.]* seconds" || true)
+  seconds=$(awk "BEGIN { printf \"%.2f\", $end - $start }")
+  times+=("$seconds")
+  echo "start-to-listening: $seconds seconds ${configured:+($configured)}"
+done
+
+printf "%s\n" "${times[@]}" | sort -n | awk -v image="${IMAGE_TAG:-latest}" \
+  '{ t[NR] = $1 } END { printf "%s: median %.2f seconds of %d runs\n", image, t[int((NR + 1) / 2)], NR }'
@@ -0,0 +1,23 @@
+# SPDX-License-Identifier: AGPL-3.0-only
+# SPDX-FileCopyrightText: 2026 Univention GmbH
+"""
+Common setup for the unit tests of the container runtime extensions.
+"""
+
+import logging
+import sys
+from pathlib import Path
+
+import pytest
+
+base_dir = (Path(__file__).parent / "../../").resolve()
+
+sys.path.insert(0, str(base_dir / "docker/udm-rest-api"))
+sys.path.insert(0, str(base_dir / "docker/udm-rest-api-python-client"))
+
+
+@pytest.fixture()
+def restore_logging(monkeypatch):
+    """Undo the patches which `logqueue.install` applies to `logging.Logger`."""
+    monkeypatch.setattr(logging.Logger, "addHandler", logging.Logger.addHandler)
+    monkeypatch.setattr(logging.Logger, "removeHandler", logging.Logger.removeHandler)
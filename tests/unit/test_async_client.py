@@ -0,0 +1,227 @@
+# SPDX-License-Identifier: AGPL-3.0-only
+# SPDX-FileCopyrightText: 2026 Univention GmbH
+
+import asyncio
+import contextlib
+import email.utils
+import time
+
+import pytest
+
+web = pytest.importorskip("aiohttp.web")
+udm_rest_async = pytest.importorskip("udm_rest_async")
+
+BASE_DN = "dc=example,dc=com"
+USERS = [f"uid=user{i},cn=users,{BASE_DN}" for i in range(5)]
+
+
+class Server:
+
+    def __init__(self):
+        self.objects = {dn: {"dn": dn, "properties": {"username": dn[4:9]}} for dn in USERS}
+        self.requests = []
+        self.failures = {}
+        self.job_not_found = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def handle(self, request):
+        self.requests.append((request.method, request.path, request.query_string))
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(0.01)
+            key = (request.method, request.path)
+            if self.failures.get(key):
+                self.failures[key] -= 1
+                return web.json_response({"error": {"message": "busy"}}, status=503, headers={"Retry-After": "0"})
+            return await self.dispatch(request)
+        finally:
+            self.in_flight -= 1
+
+    async def dispatch(self, request):
+        assert request.headers["Authorization"].startswith("Basic ")
+        path = request.path.removeprefix("/udm/")
+        if path == "ldap/base/":
+            return web.json_response({"dn": BASE_DN})
+        if path == "users/user/" and request.method == "POST":
+            data = await request.json()
+            dn = f"uid={data['properties']['username']},{data['position']}"
+            self.objects[dn] = {"dn": dn, "properties": data["properties"]}
+            return web.json_response({"dn": dn}, status=201)
+        if path == "users/user/":
+            limit, page = int(request.query["limit"]), int(request.query["page"])
+            objects = list(self.objects.values())[(page - 1) * limit:page * limit]
+            links = {"next": [{"href": "next"}]} if page * limit < len(self.objects) else {}
+            return web.json_response({"_embedded": {"udm:object": objects}, "_links": links})
+        if path == "users/user/bulk-delete":
+            self.job = {"id": "job1", "status": "running", "deleted": 0, **(await request.json())}
+            return web.json_response(self.job, status=202, headers={"Location": "/udm/bulk-delete/job1"})
+        if path == "bulk-delete/job1" and self.job_not_found:
+            self.job_not_found -= 1
+            return web.json_response({"error": "job job1 not found"}, status=404)
+        if path == "bulk-delete/job1":
+            self.job.update(status="done", deleted=len(self.objects))
+            self.objects.clear()
+            return web.json_response(self.job)
+        dn = path.removeprefix("users/user/")
+        if dn not in self.objects:
+            return web.json_response({"error": {"message": "not found"}}, status=404)
+        if request.method == "GET":
+            return web.json_response(self.objects[dn], headers={"ETag": '"1"'})
+        if request.method == "PATCH":
+            self.objects[dn]["properties"].update((await request.json())["properties"])
+            return web.Response(status=204)
+        if request.method == "DELETE":
+            del self.objects[dn]
+            return web.Response(status=204)
+
+
+@contextlib.asynccontextmanager
+async def client(server, **kwargs):
+    app = web.Application()
+    app.router.add_route("*", "/{path:.*}", server.handle)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = runner.addresses[0][1]
+    try:
+        async with udm_rest_async.UDM.http(f"http://127.0.0.1:{port}/udm", "cn=admin", "univention",
+                                           backoff=0, **kwargs) as udm:
+            yield udm
+    finally:
+        await runner.cleanup()
+
+
+def test_get_many_is_concurrent_and_limited():
+    server = Server()
+
+    async def main():
+        async with client(server, concurrency=3) as udm:
+            assert await udm.get_ldap_base() == BASE_DN
+            return await udm.get_many("users/user", USERS + ["uid=missing"])
+
+    results = asyncio.run(main())
+    assert [result.dn for result in results] == USERS + ["uid=missing"]
+    assert [result.value["dn"] for result in results[:-1]] == USERS
+    assert results[0].value["etag"] == '"1"'
+    assert isinstance(results[-1].error, udm_rest_async.NotFound)
+    assert server.max_in_flight == 3
+
+
+def test_search_pages_lazily():
+    server = Server()
+
+    async def main():
+        async with client(server) as udm:
+            found = []
+            async for obj in udm.search("users/user", "(uid=*)", page_size=2):
+                found.append(obj["dn"])
+                if len(found) == 2:
+                    assert len(server.requests) == 1
+            return found
+
+    assert asyncio.run(main()) == USERS
+    assert [query for _method, _path, query in server.requests] == [
+        f"scope=sub&limit=2&filter=(uid%3D*)&page={page}" for page in (1, 2, 3)
+    ]
+
+
+def test_modify_and_delete_many_retry():
+    server = Server()
+    server.failures[("DELETE", f"/udm/users/user/{USERS[0]}")] = 2
+
+    async def main():
+        async with client(server) as udm:
+            modified = await udm.modify_many("users/user", {USERS[1]: {"username": "renamed"}})
+            deleted = await udm.delete_many("users/user", USERS[:2] + ["uid=missing"])
+            return modified, deleted
+
+    modified, deleted = asyncio.run(main())
+    assert [result.error for result in modified + deleted] == [None] * 4
+    assert list(server.objects) == USERS[2:]
+    assert [method for method, _path, _query in server.requests].count("DELETE") == 5
+
+
+def test_modify_with_etag_is_not_retried():
+    server = Server()
+    server.failures[("PATCH", f"/udm/users/user/{USERS[0]}")] = 1
+
+    async def main():
+        async with client(server) as udm:
+            obj = await udm.get("users/user", USERS[0])
+            with pytest.raises(udm_rest_async.HTTPError) as exc:
+                await udm.modify("users/user", USERS[0], {"username": "renamed"}, etag=obj["etag"])
+            return exc.value.code
+
+    assert asyncio.run(main()) == 503
+    assert [method for method, _path, _query in server.requests].count("PATCH") == 1
+
+
+def test_retries_exhausted():
+    server = Server()
+    server.failures[("GET", f"/udm/users/user/{USERS[0]}")] = 5
+
+    async def main():
+        async with client(server, retries=1) as udm:
+            await udm.get("users/user", USERS[0])
+
+    with pytest.raises(udm_rest_async.HTTPError) as exc:
+        asyncio.run(main())
+    assert exc.value.code == 503
+
+
+def test_create_is_not_retried_by_default():
+    server = Server()
+    server.failures[("POST", "/udm/users/user/")] = 1
+
+    async def main():
+        async with client(server) as udm:
+            with pytest.raises(udm_rest_async.HTTPError) as exc:
+                await udm.create("users/user", f"cn=users,{BASE_DN}", {"username": "new"})
+            assert exc.value.code == 503
+            server.failures[("POST", "/udm/users/user/")] = 1
+            return await udm.create("users/user", f"cn=users,{BASE_DN}", {"username": "new"}, retry=True)
+
+    assert asyncio.run(main()) == f"uid=new,cn=users,{BASE_DN}"
+    assert [method for method, _path, _query in server.requests] == ["POST", "POST", "POST"]
+
+
+def test_retry_after():
+    date = email.utils.formatdate(time.time() + 30, usegmt=True)
+    assert udm_rest_async._retry_after("2", 0.5) == 2
+    assert 25 < udm_rest_async._retry_after(date, 0.5) <= 30
+    assert udm_rest_async._retry_after("Thu, 01 Jan 1970 00:00:00 GMT", 0.5) == 0
+    assert udm_rest_async._retry_after("soon", 0.5) == 0.5
+    assert udm_rest_async._retry_after(None, 0.5) == 0.5
+
+
+def test_bulk_delete_waits_for_the_job():
+    server = Server()
+
+    async def main():
+        async with client(server) as udm:
+            return await udm.bulk_delete("users/user", "(uid=*)", rate=5, poll_interval=0)
+
+    job = asyncio.run(main())
+    assert (job["status"], job["deleted"], job["rate"], job["filter"]) == ("done", 5, 5, "(uid=*)")
+    assert [(method, path) for method, path, _query in server.requests] == [
+        ("POST", "/udm/users/user/bulk-delete"), ("GET", "/udm/bulk-delete/job1"),
+    ]
+
+
+def test_bulk_delete_job_in_another_pod():
+    server = Server()
+    server.job_not_found = 2
+
+    async def main():
+        async with client(server) as udm:
+            done = await udm.bulk_delete("users/user", "(uid=*)", poll_interval=0)
+            server.job_not_found = 3
+            lost = await udm.bulk_delete("users/user", "(uid=*)", poll_interval=0, max_not_found=3)
+            return done, lost
+
+    done, lost = asyncio.run(main())
+    assert (done["status"], done["deleted"]) == ("done", 5)
+    assert (lost["status"], lost["id"]) == ("unknown", "job1")
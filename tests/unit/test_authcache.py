@@ -0,0 +1,173 @@
+# SPDX-License-Identifier: AGPL-3.0-only
+# SPDX-FileCopyrightText: 2026 Univention GmbH
+
+import asyncio
+import threading
+from types import SimpleNamespace
+
+import pytest
+from udm_rest_api_container import authcache
+
+USER_DN = "uid=automation,cn=users,dc=example,dc=com"
+
+
+class Clock:
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class HTTPError(Exception):
+
+    def __init__(self, status_code):
+        super().__init__(status_code)
+        self.status_code = status_code
+
+
+class Resource:
+
+    def __init__(self, user_dn=USER_DN):
+        self.request = SimpleNamespace(user_dn=user_dn)
+
+    calls = 0
+    allowed = True
+
+    def _auth_check_allowed_groups(self):
+        type(self).calls += 1
+        if not type(self).allowed:
+            raise HTTPError(403)
+
+
+@pytest.fixture()
+def resource_class():
+    return type("TestResource", (Resource,), {"calls": 0, "allowed": True})
+
+
+def test_cache_ttl_and_lru():
+    clock = Clock()
+    cache = authcache.AuthorizationCache(10, max_entries=2, clock=clock)
+    assert cache.get(USER_DN) == (False, None)
+    cache.put(USER_DN)
+    assert cache.get(USER_DN.upper()) == (True, None)
+    cache.put("uid=b")
+    cache.put("uid=c")
+    assert cache.get(USER_DN) == (False, None)
+    clock.now = 11
+    assert cache.get("uid=c") == (False, None)
+    assert (cache.hits, cache.misses) == (1, 3)
+
+
+def test_cache_negative_entries_need_negative_ttl():
+    denial = HTTPError(403)
+    cache = authcache.AuthorizationCache(10)
+    cache.put(USER_DN, denial)
+    assert cache.get(USER_DN) == (False, None)
+
+    cache = authcache.AuthorizationCache(10, negative_ttl=5)
+    cache.put(USER_DN, denial)
+    assert cache.get(USER_DN) == (True, denial)
+
+
+def test_cache_cleared_when_groups_change():
+    fingerprint = ["csn1"]
+    cache = authcache.AuthorizationCache(60, fingerprint=lambda: fingerprint[0], clock=Clock())
+    cache.refresh()
+    cache.put(USER_DN)
+    cache.refresh()
+    assert cache.get(USER_DN) == (True, None)
+    fingerprint[0] = "csn2"
+    cache.refresh()
+    assert cache.get(USER_DN) == (False, None)
+    assert cache.invalidations == 1
+
+
+def test_cache_cleared_when_groups_cannot_be_read():
+    cache = authcache.AuthorizationCache(60, fingerprint=lambda: 1 / 0, clock=Clock())
+    cache.put(USER_DN)
+    cache.refresh()
+    assert cache.get(USER_DN) == (False, None)
+
+
+def test_fingerprint_is_read_in_a_thread():
+    read = threading.Event()
+    threads = []
+
+    def fingerprint():
+        threads.append(threading.current_thread())
+        read.set()
+        return "csn1"
+
+    cache = authcache.AuthorizationCache(60, fingerprint=fingerprint, check_interval=60, clock=Clock())
+    cache.get(USER_DN)
+    assert threads == []
+    cache.start()
+    assert read.wait(5)
+    cache.stop()
+    assert threads[0] is not threading.main_thread()
+
+
+def test_patch_caches_allowed_users(resource_class):
+    cache = authcache.AuthorizationCache(60)
+    assert authcache.patch(cache, resource_class)
+    resource_class()._auth_check_allowed_groups()
+    resource_class()._auth_check_allowed_groups()
+    assert resource_class.calls == 1
+    resource_class(user_dn="uid=other")._auth_check_allowed_groups()
+    assert resource_class.calls == 2
+
+
+def test_patch_caches_denials(resource_class):
+    resource_class.allowed = False
+    cache = authcache.AuthorizationCache(60, negative_ttl=30)
+    authcache.patch(cache, resource_class)
+    for _ in range(2):
+        with pytest.raises(HTTPError) as exc:
+            resource_class()._auth_check_allowed_groups()
+        assert exc.value.status_code == 403
+    assert resource_class.calls == 1
+
+
+def test_patch_does_not_cache_other_errors(resource_class):
+
+    def _check(self):
+        resource_class.calls += 1
+        raise HTTPError(503)
+
+    resource_class._auth_check_allowed_groups = _check
+    cache = authcache.AuthorizationCache(60, negative_ttl=30)
+    authcache.patch(cache, resource_class)
+    for _ in range(2):
+        with pytest.raises(HTTPError):
+            resource_class()._auth_check_allowed_groups()
+    assert resource_class.calls == 2
+
+
+def test_patch_async_check():
+
+    class AsyncResource(Resource):
+        calls = 0
+
+        async def _auth_check_allowed_groups(self):
+            AsyncResource.calls += 1
+
+    cache = authcache.AuthorizationCache(60)
+    authcache.patch(cache, AsyncResource)
+    asyncio.run(AsyncResource()._auth_check_allowed_groups())
+    asyncio.run(AsyncResource()._auth_check_allowed_groups())
+    assert AsyncResource.calls == 1
+
+
+def test_patch_missing_method():
+    assert not authcache.patch(authcache.AuthorizationCache(60), object)
+
+
+def test_authorized_groups():
+    ucr = {
+        "directory/manager/rest/authorized-groups/domain-admins": "cn=Domain Admins,cn=groups,dc=example,dc=com",
+        "directory/manager/rest/authorized-groups/disabled": "",
+        "directory/manager/rest/debug_level": "2",
+    }
+    assert authcache.authorized_groups(ucr) == ["cn=Domain Admins,cn=groups,dc=example,dc=com"]
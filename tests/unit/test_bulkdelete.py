@@ -0,0 +1,265 @@
+# SPDX-License-Identifier: AGPL-3.0-only
+# SPDX-FileCopyrightText: 2026 Univention GmbH
+
+import asyncio
+import json
+import re
+import sys
+import threading
+from types import ModuleType, SimpleNamespace
+
+import pytest
+from udm_rest_api_container import bulkdelete
+
+DNS = [f"cn=entry{i},cn=blocklists,cn=internal" for i in range(5)]
+
+
+class Clock:
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def job(**kwargs):
+    clock = Clock()
+    kwargs.setdefault("rate", 10)
+    return bulkdelete.Job("blocklists/entry", "(cn=*)", clock=clock, sleep=clock.sleep, **kwargs), clock
+
+
+def test_run_is_rate_limited():
+    removed = []
+    bulk, clock = job()
+    bulk.run(lambda: DNS, removed.append)
+    assert removed == DNS
+    assert (bulk.status, bulk.matched, bulk.deleted, bulk.failed) == ("done", 5, 5, 0)
+    assert clock.sleeps == [pytest.approx(0.1)] * 4
+    assert bulk.to_json()["finished"] is not None
+
+
+def test_run_records_failures():
+
+    def remove(dn):
+        if dn == DNS[1]:
+            raise RuntimeError("permission denied")
+
+    bulk, _clock = job()
+    bulk.run(lambda: DNS, remove)
+    assert (bulk.status, bulk.deleted, bulk.failed) == ("done", 4, 1)
+    assert bulk.errors == [{"dn": DNS[1], "error": "permission denied"}]
+
+
+def test_run_dry_run_and_cancel():
+    removed = []
+    bulk, clock = job(dry_run=True)
+    bulk.run(lambda: DNS, removed.append)
+    assert (bulk.status, bulk.matched, removed, clock.sleeps) == ("done", 5, [], [])
+
+    bulk, _clock = job()
+
+    def remove(dn):
+        removed.append(dn)
+        bulk.cancelled.set()
+
+    bulk.run(lambda: DNS, remove)
+    assert (bulk.status, bulk.deleted, removed) == ("cancelled", 1, DNS[:1])
+
+
+def test_run_search_failure():
+
+    def search():
+        raise RuntimeError("no such object")
+
+    bulk, _clock = job()
+    bulk.run(search, lambda dn: None)
+    assert (bulk.status, bulk.error, bulk.done) == ("failed", "no such object", True)
+
+
+def test_manager_limits_jobs_and_rate():
+    manager = bulkdelete.JobManager(max_rate=20, max_jobs=1)
+    assert (manager.rate(None), manager.rate(5), manager.rate(100)) == (20, 5, 20)
+
+    release = threading.Event()
+    first, _clock = job()
+    assert manager.start(first, lambda: DNS, lambda dn: release.wait(5))
+    second, _clock = job()
+    assert not manager.start(second, lambda: DNS, lambda dn: None)
+    assert manager.running == 1
+    release.set()
+    for thread in threading.enumerate():
+        if thread.name == f"bulk-delete-{first.id}":
+            thread.join(5)
+    assert (first.status, manager.objects_deleted, manager.running) == ("done", 5, 0)
+    assert manager.get(first.id) is first
+    assert manager.get(second.id) is None
+
+
+@pytest.mark.parametrize("body,error", [
+    (b"not json", "not JSON"),
+    (b"{}", "'filter' is required"),
+    (b'{"filter": " "}', "'filter' is required"),
+    (b'{"filter": "(cn=*)", "scope": "children"}', "'scope'"),
+])
+def test_parse_errors(body, error):
+    with pytest.raises(ValueError, match=error):
+        bulkdelete._parse(body)
+
+
+class Resource:
+
+    def __init__(self, method, path, body=b""):
+        self.request = SimpleNamespace(method=method, path=path, body=body)
+        self.ldap_connection = "lo"
+        self.headers = {}
+        self.status = None
+        self.body = None
+
+    def set_status(self, status):
+        self.status = status
+
+    def set_header(self, name, value):
+        self.headers[name] = value
+
+    def finish(self, body):
+        self.body = json.loads(body)
+
+
+class Application:
+
+    def __init__(self, handlers):
+        self.rules = list(handlers)
+
+    def add_handlers(self, host_pattern, handlers):
+        self.rules[:0] = handlers
+
+
+def request(app, method, path, body=b""):
+    for pattern, handler in app.rules:
+        match = re.fullmatch(pattern, path)
+        if match:
+            resource = handler(method, path, body)
+            asyncio.run(getattr(resource, method.lower())(*match.groups()))
+            return resource
+    raise AssertionError(f"no route for {path}")
+
+
+def test_patch_adds_resources():
+    manager = bulkdelete.JobManager(max_rate=1000)
+    removed = []
+    connections = []
+
+    def operations(lo, module, filter, position, scope):
+        # Opening the connection and initializing the module read LDAP, they must not block the event loop.
+        assert threading.current_thread() is not threading.main_thread()
+        if module != "blocklists/entry":
+            raise LookupError(f"unknown module {module}")
+        assert (lo, filter, position, scope) == ("cloned lo", "(cn=*)", "cn=internal", "one")
+        return (lambda: DNS), removed.append
+
+    def connect(lo):
+        connections.append(lo)
+        return "cloned lo"
+
+    module = SimpleNamespace(__name__="univention.admin.rest.module", Resource=Resource, Application=Application)
+    assert bulkdelete.patch(manager, module, operations, connect)
+    app = module.Application([(r".*/udm/([^/]+/[^/]+)/(.+)", object)])
+
+    body = json.dumps({"filter": "(cn=*)", "position": "cn=internal", "scope": "one", "rate": 500}).encode()
+    started = request(app, "POST", "/univention/udm/blocklists/entry/bulk-delete", body)
+    assert started.status == 202
+    assert started.body["rate"] == 500
+    location = started.headers["Location"]
+    assert location == f"/univention/udm/bulk-delete/{started.body['id']}"
+    assert connections == ["lo"]
+
+    for _ in range(100):
+        progress = request(app, "GET", location)
+        if progress.body["status"] == "done":
+            break
+        threading.Event().wait(0.01)
+    assert (progress.status, progress.body["deleted"], removed) == (200, 5, DNS)
+
+    assert request(app, "DELETE", location).status == 202
+    assert request(app, "GET", "/udm/bulk-delete/unknown").status == 404
+    assert request(app, "POST", "/udm/users/nothing/bulk-delete", body).status == 404
+    assert request(app, "POST", "/udm/blocklists/entry/bulk-delete", b"{}").status == 422
+
+
+def test_patch_unsupported_authentication():
+    manager = bulkdelete.JobManager()
+    module = SimpleNamespace(__name__="univention.admin.rest.module", Resource=Resource, Application=Application)
+    assert bulkdelete.patch(manager, module, connect=bulkdelete.clone_connection)
+    app = module.Application([])
+
+    response = request(app, "POST", "/udm/blocklists/entry/bulk-delete", b'{"filter": "(cn=*)"}')
+    assert response.status == 501
+    assert response.body == {"error": "bulk delete requires authentication with a username and password"}
+    assert manager.jobs == {}
+
+
+def test_patch_connection_failed():
+    def connect(lo):
+        raise bulkdelete.ConnectionFailed("connecting to the LDAP server failed: Can't contact LDAP server")
+
+    module = SimpleNamespace(__name__="univention.admin.rest.module", Resource=Resource, Application=Application)
+    assert bulkdelete.patch(bulkdelete.JobManager(), module, connect=connect)
+    response = request(module.Application([]), "POST", "/udm/blocklists/entry/bulk-delete", b'{"filter": "(cn=*)"}')
+    assert response.status == 502
+    assert "Can't contact LDAP server" in response.body["error"]
+
+
+@pytest.fixture
+def uldap(monkeypatch):
+    """Fake `ldap`, `univention.uldap` and `univention.admin.uldap` which record the connections opened."""
+    modules = {name: ModuleType(name) for name in ("ldap", "univention", "univention.admin", "univention.uldap",
+                                                    "univention.admin.uldap")}
+    modules["ldap"].LDAPError = type("LDAPError", (Exception,), {})
+    modules["univention"].uldap = modules["univention.uldap"]
+    modules["univention"].admin = modules["univention.admin"]
+    modules["univention.admin"].uldap = modules["univention.admin.uldap"]
+    opened = []
+
+    def access(**kwargs):
+        if kwargs.get("start_tls") == 2:
+            raise modules["ldap"].LDAPError("StartTLS required")
+        opened.append(kwargs)
+        return kwargs
+
+    modules["univention.uldap"].access = access
+    modules["univention.admin.uldap"].access = lambda lo: SimpleNamespace(lo=lo)
+    for name, module in modules.items():
+        monkeypatch.setitem(sys.modules, name, module)
+    return opened
+
+
+def test_clone_connection_keeps_the_tls_settings(uldap):
+    inner = SimpleNamespace(
+        host="ldap-server", port=389, base="dc=example,dc=com", binddn="uid=admin,dc=example,dc=com", bindpw="secret",
+        start_tls=0, ca_certfile="/run/secrets/ca_cert", uri="ldap://ldap-server:389",
+    )
+    assert bulkdelete.clone_connection(SimpleNamespace(lo=inner)).lo == {
+        "host": "ldap-server", "port": 389, "base": "dc=example,dc=com", "binddn": "uid=admin,dc=example,dc=com",
+        "bindpw": "secret", "start_tls": 0, "ca_certfile": "/run/secrets/ca_cert", "uri": "ldap://ldap-server:389",
+    }
+
+    inner.start_tls = 2
+    with pytest.raises(bulkdelete.ConnectionFailed, match="StartTLS required"):
+        bulkdelete.clone_connection(SimpleNamespace(lo=inner))
+
+
+def test_clone_connection_requires_a_password():
+    lo = SimpleNamespace(lo=SimpleNamespace(binddn="uid=admin,dc=example,dc=com", bindpw=None))
+    with pytest.raises(bulkdelete.UnsupportedAuthentication):
+        bulkdelete.clone_connection(lo)
+
+
+def test_patch_without_application():
+    module = SimpleNamespace(__name__="univention.admin.rest.module", Resource=Resource)
+    assert not bulkdelete.patch(bulkdelete.JobManager(), module)
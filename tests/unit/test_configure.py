@@ -0,0 +1,100 @@
+# SPDX-License-Identifier: AGPL-3.0-only
+# SPDX-FileCopyrightText: 2026 Univention GmbH
+
+import pytest
+from udm_rest_api_container import configure
+
+UCR = {
+    "ldap/server/name": "ldap-server",
+    "ldap/server/port": "389",
+    "ldap/base": "dc=univention-organization,dc=intranet",
+}
+
+
+@pytest.mark.parametrize("start_tls,reqcert", [(None, "demand"), ("2", "demand"), ("1", "allow")])
+def test_link_ca_certificate(tmp_path, start_tls, reqcert):
+    ca_cert = tmp_path / "ca.crt"
+    ca_cert.write_text("cert")
+    ca_dir = tmp_path / "ucsCA"
+    ucr = dict(UCR, **{"uldap/start-tls": start_tls})
+    assert configure.link_ca_certificate(ucr, {"CA_CERT_FILE": str(ca_cert)}, ca_dir) == reqcert
+    assert (ca_dir / "CAcert.pem").resolve() == ca_cert
+    # linking again replaces the link
+    configure.link_ca_certificate(ucr, {"CA_CERT_FILE": str(ca_cert)}, ca_dir)
+
+
+def test_link_ca_certificate_tls_off(tmp_path):
+    ucr = dict(UCR, **{"uldap/start-tls": "0"})
+    assert configure.link_ca_certificate(ucr, {}, tmp_path / "ucsCA") == "never"
+    assert not (tmp_path / "ucsCA").exists()
+
+
+def test_link_ca_certificate_errors(tmp_path):
+    with pytest.raises(configure.ConfigurationError, match="must be one of"):
+        configure.link_ca_certificate(dict(UCR, **{"uldap/start-tls": "3"}), {}, tmp_path)
+    with pytest.raises(configure.ConfigurationError, match="is not a file at /missing"):
+        configure.link_ca_certificate(UCR, {"CA_CERT_FILE": "/missing"}, tmp_path)
+
+
+def test_render_ldap_conf():
+    assert configure.render_ldap_conf(UCR, "demand") == """\
+# This file should be world readable but not world writable.
+
+TLS_CACERT /etc/univention/ssl/ucsCA/CAcert.pem
+TLS_REQCERT demand
+
+URI ldap://ldap-server:389
+
+BASE dc=univention-organization,dc=intranet
+"""
+    assert "\n\nTLS_REQCERT never\n" in configure.render_ldap_conf(UCR, "never")
+
+
+def test_write_ldap_conf(tmp_path):
+    path = tmp_path / "ldap" / "ldap.conf"
+    configure.write_ldap_conf("content", path)
+    assert not path.exists()
+
+    path.write_text("")
+    configure.write_ldap_conf("content", path)
+    assert path.read_text() == "content"
+    assert path.stat().st_mode & 0o777 == 0o644
+
+
+def test_link_secrets_from_files(tmp_path):
+    for name in ("ldap_secret", "machine_secret"):
+        (tmp_path / name).write_text(name)
+    env = {
+        "LDAP_SECRET_FILE": str(tmp_path / "ldap_secret"),
+        "MACHINE_SECRET_FILE": str(tmp_path / "machine_secret"),
+    }
+    configure.link_secrets(env, tmp_path / "ldap.secret", tmp_path / "machine.secret")
+    assert (tmp_path / "ldap.secret").read_text() == "ldap_secret"
+    assert (tmp_path / "machine.secret").is_symlink()
+
+
+def test_link_secrets_from_env(tmp_path):
+    env = {
+        "LDAP_SECRET_FILE": str(tmp_path / "missing"),
+        "MACHINE_SECRET_FILE": str(tmp_path / "missing"),
+        "MACHINE_SECRET": "univention",
+    }
+    configure.link_secrets(env, tmp_path / "ldap.secret", tmp_path / "machine.secret")
+    assert not (tmp_path / "ldap.secret").exists()
+    assert (tmp_path / "machine.secret").read_text() == "univention"
+
+    del env["MACHINE_SECRET"]
+    with pytest.raises(configure.ConfigurationError, match="No LDAP machine secret found"):
+        configure.link_secrets(env, tmp_path / "ldap.secret", tmp_path / "machine.secret")
+
+
+def test_configure_runs_only_the_given_steps(monkeypatch):
+    calls = []
+    monkeypatch.setattr(configure, "link_ca_certificate", lambda ucr, env: calls.append("ca") or "demand")
+    monkeypatch.setattr(configure, "write_ldap_conf", lambda content: calls.append("ldap.conf"))
+    monkeypatch.setattr(configure, "link_secrets", lambda env: calls.append("secrets"))
+    monkeypatch.setattr(configure, "commit_directory_reports", lambda ucr: calls.append("reports"))
+    configure.configure(UCR, {}, ["directory-reports"])
+    assert calls == ["reports"]
+    configure.configure(UCR, {})
+    assert calls == ["reports", "ca", "ldap.conf", "secrets", "reports"]
@@ -0,0 +1,113 @@
+# SPDX-License-Identifier: AGPL-3.0-only
+# SPDX-FileCopyrightText: 2026 Univention GmbH
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+requests = pytest.importorskip("requests")
+udm_rest_discovery_cache = pytest.importorskip("udm_rest_discovery_cache")
+
+
+@pytest.fixture
+def server():
+    state = {"etag": '"1"', "requests": []}
+
+    class Handler(BaseHTTPRequestHandler):
+
+        def do_GET(self):
+            state["requests"].append((self.path, self.headers.get("If-None-Match")))
+            if self.headers.get("If-None-Match") == state["etag"]:
+                self.send_response(304)
+                self.end_headers()
+                return
+            body = json.dumps({"path": self.path, "etag": state["etag"]}).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("ETag", state["etag"])
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    httpd.url = f"http://127.0.0.1:{httpd.server_address[1]}/univention/udm/"
+    httpd.state = state
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def session(cache):
+    session = requests.Session()
+    adapter = udm_rest_discovery_cache.DiscoveryCacheAdapter(cache)
+    session.mount("http://", adapter)
+    session.auth = ("cn=admin", "univention")
+    return session
+
+
+@pytest.mark.parametrize("path,expected", [
+    ("/udm/", True),
+    ("/univention/udm/users/", True),
+    ("/udm/users/user/add", True),
+    ("/udm/users/user/properties", True),
+    ("/udm/openapi.json", True),
+    ("/udm/ldap/base/", True),
+    ("/udm/users/user/", False),
+    ("/udm/users/user/uid%3Dadmin%2Ccn%3Dusers", False),
+    ("/other/", False),
+])
+def test_is_discovery(path, expected):
+    assert udm_rest_discovery_cache.is_discovery(f"http://localhost{path}?x=1") is expected
+
+
+def test_fresh_entries_are_served_from_disk(server, tmp_path):
+    cache = udm_rest_discovery_cache.DiscoveryCache(tmp_path, max_age=300)
+    first = session(cache).get(server.url).json()
+    second = session(cache).get(server.url).json()
+    assert first == second == {"path": "/univention/udm/", "etag": '"1"'}
+    assert len(server.state["requests"]) == 1
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_stale_entries_are_revalidated(server, tmp_path):
+    cache = udm_rest_discovery_cache.DiscoveryCache(tmp_path, max_age=0)
+    session(cache).get(server.url)
+    assert session(cache).get(server.url).json()["etag"] == '"1"'
+    server.state["etag"] = '"2"'
+    assert session(cache).get(server.url).json()["etag"] == '"2"'
+    assert server.state["requests"] == [
+        ("/univention/udm/", None), ("/univention/udm/", '"1"'), ("/univention/udm/", '"1"'),
+    ]
+    assert (cache.hits, cache.revalidations, cache.misses) == (0, 1, 2)
+
+
+def test_other_requests_and_users_are_not_shared(server, tmp_path):
+    cache = udm_rest_discovery_cache.DiscoveryCache(tmp_path, max_age=300)
+    session(cache).get(server.url + "users/user/")
+    session(cache).get(server.url + "users/user/")
+    other = session(cache)
+    other.auth = ("uid=other", "univention")
+    session(cache).get(server.url)
+    other.get(server.url)
+    assert len(server.state["requests"]) == 4
+
+
+def test_install(server, tmp_path, monkeypatch):
+    monkeypatch.setattr(requests.Session, "__init__", requests.Session.__init__)
+    monkeypatch.setenv("UDM_CLIENT_CACHE_DIR", str(tmp_path))
+    cache = udm_rest_discovery_cache.install_from_environment()
+    requests.Session().get(server.url)
+    requests.Session().get(server.url)
+    assert cache.hits == 1
+    assert len(list(tmp_path.glob("*.json"))) == 1
+
+
+def test_install_disabled(monkeypatch):
+    monkeypatch.setenv("UDM_CLIENT_CACHE_DIR", "")
+    assert udm_rest_discovery_cache.install_from_environment() is None
@@ -0,0 +1,93 @@
+# SPDX-License-Identifier: AGPL-3.0-only
+# SPDX-FileCopyrightText: 2026 Univention GmbH
+
+import importlib.util
+import json
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pytest
+
+script = Path(__file__).parent / "../generate-scale-ldif.py"
+spec = importlib.util.spec_from_file_location("generate_scale_ldif", script)
+generate_scale_ldif = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(generate_scale_ldif)
+
+BASE_DN = "dc=example,dc=com"
+
+
+def read_ldif(path: Path):
+    entries = {}
+    for block in path.read_text().strip().split("\n\n"):
+        lines = block.splitlines()
+        attributes = entries.setdefault(lines[0].removeprefix("dn: "), {})
+        for line in lines[1:]:
+            key, value = line.split(": ", 1)
+            attributes.setdefault(key, []).append(value)
+    return entries
+
+
+@pytest.fixture
+def generate(tmp_path):
+
+    def _generate(*args):
+        generate_scale_ldif.main([
+            "--output-dir", str(tmp_path), "--base-dn", BASE_DN,
+            "--users", "50", "--groups", "5", "--members", "10", "--blocklists", "2", "--entries", "20",
+            *args,
+        ])
+        return (
+            read_ldif(tmp_path / "main.ldif"),
+            read_ldif(tmp_path / "internal.ldif"),
+            json.loads((tmp_path / "manifest.json").read_text()),
+        )
+
+    return _generate
+
+
+def test_counts(generate):
+    main, internal, manifest = generate("--expired", "0.5", "--without-identifier", "0.2")
+
+    assert len(main) == 3 + 50 + 5
+    assert len(internal) == 2 + 2 * 20
+    assert (manifest["users"], manifest["groups"]) == (50, 5)
+    assert (manifest["blocklists"], manifest["blocklist_entries"]) == (2, 40)
+    assert manifest["base_dn"] == f"cn=scale,{BASE_DN}"
+
+    without_identifier = [dn for dn, attrs in main.items() if "univentionObjectIdentifier" not in attrs]
+    assert len(without_identifier) == manifest["without_identifier"]
+    assert 0 < len(without_identifier) < 55
+    assert set(manifest["samples"]["without_identifier"]) <= set(without_identifier)
+
+    now = datetime.now(timezone.utc).strftime("%Y%m%d%H%M%SZ")
+    expired = [dn for dn, attrs in internal.items() if attrs.get("univentionBlockedUntil", [now])[0] < now]
+    assert len(expired) == manifest["expired_entries"]
+    assert 0 < len(expired) < 40
+    assert set(manifest["samples"]["expired"]) <= set(expired)
+
+
+def test_parents_before_children(generate):
+    main, internal, _manifest = generate()
+    for entries, root in ((main, BASE_DN), (internal, generate_scale_ldif.BLOCKLISTS_DN)):
+        seen = {root}
+        for dn in entries:
+            assert dn.split(",", 1)[1] in seen
+            seen.add(dn)
+
+
+def test_groups(generate):
+    main, _internal, _manifest = generate()
+    group = main[f"cn=scale-group-0,cn=groups,cn=scale,{BASE_DN}"]
+    assert len(group["uniqueMember"]) == len(group["memberUid"]) == 10
+    assert all(member in main for member in group["uniqueMember"])
+
+
+def test_deterministic(generate):
+    first = generate("--seed", "1")
+    second = generate("--seed", "1")
+    assert first[0] == second[0]
+
+
+def test_invalid_share():
+    with pytest.raises(SystemExit):
+        generate_scale_ldif.parse_args(["--expired", "1.5"])
@@ -0,0 +1,37 @@
+# SPDX-License-Identifier: AGPL-3.0-only
+# SPDX-FileCopyrightText: 2026 Univention GmbH
+
+import importlib
+import sys
+
+from udm_rest_api_container import hooks
+
+
+def test_when_imported_runs_after_import(tmp_path, monkeypatch):
+    (tmp_path / "hooked_module.py").write_text("VALUE = 1\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    seen = []
+    hooks.when_imported("hooked_module", lambda module: seen.append(module.VALUE))
+    assert seen == []
+
+    importlib.import_module("hooked_module")
+    assert seen == [1]
+    del sys.modules["hooked_module"]
+
+
+def test_when_imported_runs_for_imported_modules():
+    seen = []
+    hooks.when_imported("json", lambda module: seen.append(module.__name__))
+    assert seen == ["json"]
+
+
+def test_when_imported_survives_failing_callbacks(tmp_path, monkeypatch):
+    (tmp_path / "broken_hook_module.py").write_text("VALUE = 2\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    seen = []
+    hooks.when_imported("broken_hook_module", lambda module: 1 / 0)
+    hooks.when_imported("broken_hook_module", lambda module: seen.append(module.VALUE))
+
+    importlib.import_module("broken_hook_module")
+    assert seen == [2]
+    del sys.modules["broken_hook_module"]
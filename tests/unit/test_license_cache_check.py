@@ -0,0 +1,124 @@
+# SPDX-License-Identifier: AGPL-3.0-only
+# SPDX-FileCopyrightText: 2026 Univention GmbH
+
+import importlib.util
+import sys
+from pathlib import Path
+from types import ModuleType
+
+import pytest
+
+script = Path(__file__).parent / "../../docker/udm-rest-api/univention-license-cache-check.py"
+spec = importlib.util.spec_from_file_location("license_cache_check", script)
+license_cache_check = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(license_cache_check)
+
+DAY = 24 * 3600
+NOW = 1_800_000_000.0
+
+
+@pytest.fixture
+def state(tmp_path):
+    return license_cache_check.LicenseState(str(tmp_path / "license-counters.sqlite"))
+
+
+def sync(state, name, cookie="cookie", **messages):
+    class_sync = license_cache_check.ClassSync(state, name)
+    for uuid in messages.get("entries", []):
+        class_sync.entry(uuid)
+    if "deleted" in messages:
+        class_sync.delete(messages["deleted"])
+    if "present" in messages:
+        class_sync.present(messages["present"])
+        class_sync.present(None)
+    class_sync.commit(cookie)
+
+
+def test_entries_and_deletes_update_the_counters(state):
+    sync(state, "users", entries=["u1", "u2", "u3"])
+    sync(state, "servers", entries=["s1"])
+    sync(state, "users", entries=["u2", "u4"], deleted=["u1"])
+    assert state.counts() == {"users": 3, "servers": 1}
+    assert state.get_cookie("users") == "cookie"
+
+
+def test_present_phase_removes_members_not_presented(state):
+    sync(state, "users", entries=["u1", "u2", "u3"])
+    sync(state, "servers", entries=["s1"])
+    sync(state, "users", entries=["u4"], present=["u1"])
+    assert state.counts() == {"users": 2, "servers": 1}
+
+
+def test_rollback_and_clear(state):
+    sync(state, "users", entries=["u1"])
+    class_sync = license_cache_check.ClassSync(state, "users")
+    class_sync.entry("u2")
+    class_sync.rollback()
+    assert state.counts() == {"users": 1}
+    state.clear("users")
+    assert (state.counts(), state.get_cookie("users")) == ({}, None)
+
+
+def test_state_is_persisted(state, tmp_path):
+    sync(state, "users", entries=["u1"])
+    state.set_recount({"users": 1}, "20260719121500.123456Z#000000#000#000000", NOW)
+    reopened = license_cache_check.LicenseState(str(tmp_path / "license-counters.sqlite"))
+    assert reopened.counts() == {"users": 1}
+    assert reopened.last_recount() == {
+        "counts": {"users": 1}, "csn": "20260719121500.123456Z#000000#000#000000", "time": NOW,
+    }
+
+
+def test_recount_reason_with_counters():
+    reason = license_cache_check.recount_reason
+    recount = {"counts": {"users": 10, "servers": 1}, "csn": "a", "time": NOW - 3600}
+    assert reason(NOW, None, DAY, {"users": 10}) == "no recount was recorded yet"
+    assert reason(NOW, recount, DAY, {"users": 10, "servers": 1}, "b") is None
+    assert reason(NOW, recount, DAY, {"users": 11, "servers": 1, "clients": 2}) == (
+        "licensed objects changed: clients 0 -> 2, users 10 -> 11"
+    )
+    assert reason(NOW + DAY, recount, DAY, {"users": 10, "servers": 1}) == "periodic reconciliation"
+
+
+def test_recount_reason_falls_back_to_the_stored_csn():
+    reason = license_cache_check.recount_reason
+    recount = {"counts": {}, "csn": "a", "time": NOW - 3600}
+    assert reason(NOW, recount, DAY, None, "a") is None
+    assert reason(NOW, recount, DAY, None, "b") == "the contextCSN changed since the last recount: b"
+    assert reason(NOW, recount, DAY, None, None) == "the LDAP base has no contextCSN"
+
+
+class FakeLDAPError(Exception):
+    pass
+
+
+class Connection:
+
+    def __init__(self, fails):
+        self.fails = fails
+        self.calls = 0
+
+    def start_tls_s(self):
+        self.calls += 1
+        if self.fails:
+            raise FakeLDAPError("TLS not supported")
+
+
+@pytest.fixture
+def fake_ldap(monkeypatch):
+    module = ModuleType("ldap")
+    module.LDAPError = FakeLDAPError
+    monkeypatch.setitem(sys.modules, "ldap", module)
+
+
+def test_start_tls(fake_ldap):
+    for mode in (0, 1, 2):
+        conn = Connection(fails=False)
+        license_cache_check.start_tls(conn, mode)
+        assert conn.calls == (1 if mode else 0)
+
+    conn = Connection(fails=True)
+    license_cache_check.start_tls(conn, 1)
+    assert conn.calls == 1
+    with pytest.raises(FakeLDAPError):
+        license_cache_check.start_tls(Connection(fails=True), 2)
@@ -0,0 +1,136 @@
+# SPDX-License-Identifier: AGPL-3.0-only
+# SPDX-FileCopyrightText: 2026 Univention GmbH
+
+import logging
+
+import pytest
+from udm_rest_api_container import logqueue
+
+
+class ListHandler(logging.Handler):
+
+    def __init__(self, level=logging.NOTSET):
+        super().__init__(level)
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+def make_record(name="univention.admin.rest", level=logging.DEBUG, msg="message %s", args=("arg",)):
+    return logging.LogRecord(name, level, __file__, 0, msg, args, None)
+
+
+def test_parse_sampling():
+    assert logqueue.parse_sampling("") == {}
+    assert logqueue.parse_sampling("univention.admin.rest=0.1, tornado.access=1") == {
+        "univention.admin.rest": 0.1,
+        "tornado.access": 1.0,
+    }
+
+
+@pytest.mark.parametrize("value", ["univention", "=0.5", "univention=abc", "univention=2"])
+def test_parse_sampling_invalid(value):
+    with pytest.raises(ValueError):
+        logqueue.parse_sampling(value)
+
+
+def test_sampling_filter_passes_every_nth_debug_record():
+    sampling = logqueue.SamplingFilter({"univention.admin": 0.25})
+    passed = [sampling.filter(make_record("univention.admin.rest")) for _ in range(8)]
+    assert passed.count(True) == 2
+    assert sampling.sampled_out == 6
+
+
+@pytest.mark.parametrize("rate", [0.1, 0.6, 0.7, 0.9])
+def test_sampling_filter_passes_the_configured_share(rate):
+    sampling = logqueue.SamplingFilter({"univention.admin": rate})
+    passed = [sampling.filter(make_record("univention.admin.rest")) for _ in range(1000)]
+    assert passed.count(True) == round(rate * 1000)
+
+
+def test_sampling_filter_keeps_info_and_unknown_categories():
+    sampling = logqueue.SamplingFilter({"univention.admin": 0})
+    assert sampling.filter(make_record("univention.admin.rest", logging.INFO))
+    assert sampling.filter(make_record("univention.admindiary"))
+    assert not sampling.filter(make_record("univention.admin.rest"))
+
+
+def test_sampling_filter_most_specific_category_wins():
+    sampling = logqueue.SamplingFilter({"univention": 0, "univention.admin.rest": 1})
+    assert sampling.filter(make_record("univention.admin.rest.module"))
+    assert not sampling.filter(make_record("univention.admin.handlers"))
+
+
+def test_log_queue_writes_in_background():
+    log_queue = logqueue.LogQueue(10)
+    target = ListHandler()
+    handler = logqueue.AsyncHandler(target, log_queue)
+    handler.handle(make_record())
+    log_queue.stop(5)
+    assert [record.getMessage() for record in target.records] == ["message arg"]
+
+
+def test_log_queue_drops_and_reports_on_overflow():
+    log_queue = logqueue.LogQueue(2)
+    target = ListHandler()
+    handler = logqueue.AsyncHandler(target, log_queue)
+    log_queue._ensure_started = lambda: None
+    for _ in range(5):
+        handler.handle(make_record())
+    assert log_queue.dropped == 3
+
+    del log_queue._ensure_started
+    log_queue._ensure_started()
+    log_queue.stop(5)
+    assert len(target.records) == 3
+    assert target.records[-1].getMessage() == "Log queue overflow: dropped 3 log records (3 in total)"
+
+
+def test_async_handler_respects_target_level():
+    log_queue = logqueue.LogQueue(10)
+    target = ListHandler(logging.WARNING)
+    handler = logqueue.AsyncHandler(target, log_queue)
+    assert not handler.handle(make_record(level=logging.INFO))
+    assert log_queue.queue.empty()
+
+
+def test_install_wraps_added_handlers(restore_logging):
+    log_queue = logqueue.install(10, {"test.logqueue": 0})
+    log = logging.getLogger("test.logqueue")
+    target = ListHandler()
+    log.addHandler(target)
+    log.addHandler(target)
+    try:
+        assert len(log.handlers) == 1
+        assert isinstance(log.handlers[0], logqueue.AsyncHandler)
+        assert log.handlers[0].target is target
+
+        log.setLevel(logging.DEBUG)
+        log.debug("sampled out")
+        log.info("written")
+        log_queue.stop(5)
+        assert [record.getMessage() for record in target.records] == ["written"]
+    finally:
+        log.removeHandler(target)
+    assert log.handlers == []
+
+
+def test_install_samples_once_for_all_handlers(restore_logging):
+    logqueue.install(0, {"test.logqueue.sampled": 0.5})
+    log = logging.getLogger("test.logqueue.sampled")
+    log.propagate = False
+    targets = [ListHandler(), ListHandler()]
+    for target in targets:
+        log.addHandler(target)
+    try:
+        log.setLevel(logging.DEBUG)
+        for i in range(100):
+            log.debug("record %d", i)
+        sampling = log.handlers[0].filters[0]
+        assert [len(target.records) for target in targets] == [50, 50]
+        assert targets[0].records == targets[1].records
+        assert sampling.sampled_out == 50
+    finally:
+        for target in targets:
+            log.removeHandler(target)
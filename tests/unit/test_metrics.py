@@ -0,0 +1,37 @@
+# SPDX-License-Identifier: AGPL-3.0-only
+# SPDX-FileCopyrightText: 2026 Univention GmbH
+
+import asyncio
+
+from udm_rest_api_container.metrics import Registry, RequestCounter
+
+
+def test_render():
+    registry = Registry()
+    values = {"requests": 0}
+    registry.counter("udm_rest_requests_total", "Handled requests.", lambda: values["requests"])
+    registry.gauge("udm_rest_in_flight", "Requests in flight.", lambda: 2)
+    values["requests"] = 5
+    assert registry.render() == """\
+# HELP udm_rest_requests_total Handled requests.
+# TYPE udm_rest_requests_total counter
+udm_rest_requests_total 5
+# HELP udm_rest_in_flight Requests in flight.
+# TYPE udm_rest_in_flight gauge
+udm_rest_in_flight 2
+"""
+
+
+def test_request_counter():
+    counter = RequestCounter()
+    observed = []
+
+    class Handler:
+
+        async def _execute(self):
+            observed.append(counter.in_flight)
+
+    counter.patch(Handler)
+    asyncio.run(Handler()._execute())
+    assert observed == [1]
+    assert (counter.in_flight, counter.total) == (0, 1)
@@ -0,0 +1,117 @@
+# SPDX-License-Identifier: AGPL-3.0-only
+# SPDX-FileCopyrightText: 2026 Univention GmbH
+
+import asyncio
+import json
+import time
+import urllib.request
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+import pytest
+from udm_rest_api_container import profiling
+from udm_rest_api_container.admin import AdminServer
+
+
+def busy(seconds):
+    end = time.process_time() + seconds
+    while time.process_time() < end:
+        pass
+
+
+@pytest.fixture()
+def store(tmp_path):
+    return profiling.ProfileStore(str(tmp_path / "profiles"), 1024)
+
+
+def test_sampling_profiler_collects_stacks():
+    profiler = profiling.SamplingProfiler(0.001)
+    profiler.start()
+    busy(0.1)
+    stacks = profiler.stop()
+    assert any(stack.startswith("MainThread;") and "busy (" in stack for stack in stacks)
+
+
+def test_sampling_profiler_includes_worker_threads():
+    profiler = profiling.SamplingProfiler(0.001)
+    profiler.start()
+    with ThreadPoolExecutor(1, thread_name_prefix="worker") as pool:
+        pool.submit(busy, 0.1).result()
+    stacks = profiler.stop()
+    assert any(stack.startswith("worker") and stack.split(";")[-1].startswith("busy (") for stack in stacks)
+    # The main thread waiting for the result is idle.
+    assert not any(stack.startswith("MainThread;") for stack in stacks)
+
+
+def test_store_write_and_get(store):
+    path = store.write("GET-/udm/users/user/", Counter({"a;b": 3, "a": 1}))
+    assert path.name.endswith("-GET-_udm_users_user.collapsed")
+    assert path.read_text() == "a;b 3\na 1\n"
+    assert store.get(path.name) == path
+    assert store.get("../" + path.name) is None
+    assert store.get("missing.collapsed") is None
+
+
+def test_store_removes_oldest_profiles(store):
+    first = store.write("first", Counter({"x" * 400: 1}))
+    time.sleep(0.01)
+    second = store.write("second", Counter({"y" * 400: 1}))
+    time.sleep(0.01)
+    third = store.write("third", Counter({"z" * 400: 1}))
+    assert not first.exists()
+    assert second.exists() and third.exists()
+    assert store.write("huge", Counter({"h" * 2000: 1})) is None
+
+
+def test_request_profiler_selection(store):
+    profiler = profiling.RequestProfiler(store, token="secret")
+    assert profiler.wants({"X-UDM-Profile": "secret"})
+    assert not profiler.wants({"X-UDM-Profile": "guess"})
+    assert not profiler.wants({})
+    profiler.active = True
+    assert not profiler.wants({"X-UDM-Profile": "secret"})
+
+    assert not profiling.RequestProfiler(store).wants({"X-UDM-Profile": ""})
+    assert profiling.RequestProfiler(store, sample_rate=1).wants({})
+
+
+def test_request_profiler_patches_handler(tmp_path):
+
+    class Handler:
+        async def _execute(self, *args):
+            busy(0.05)
+            return args
+
+    store = profiling.ProfileStore(str(tmp_path), 1024 * 1024)
+    profiler = profiling.RequestProfiler(store, token="secret", interval=0.001)
+    profiling.install(profiler, [Handler])
+
+    handler = Handler()
+    handler.request = SimpleNamespace(method="GET", path="/udm/", headers={})
+    assert asyncio.run(handler._execute(1)) == (1,)
+    assert store.list() == []
+
+    handler.request.headers = {"X-UDM-Profile": "secret"}
+    assert asyncio.run(handler._execute(2)) == (2,)
+    assert not profiler.active
+    assert len(store.list()) == 1
+
+
+def test_admin_endpoint_serves_profiles(store):
+    profiler = profiling.RequestProfiler(store)
+    path = store.write("GET-/udm/", Counter({"a;b": 1}))
+    admin = AdminServer("127.0.0.1", 0)
+    profiler.routes(admin)
+    admin.start()
+    try:
+        url = f"http://127.0.0.1:{admin.port}/profiles/"
+        with urllib.request.urlopen(url) as response:
+            assert json.load(response) == [{"name": path.name, "size": 6}]
+        with urllib.request.urlopen(url + path.name) as response:
+            assert response.read() == b"a;b 1\n"
+        with pytest.raises(urllib.error.HTTPError) as exc:
+            urllib.request.urlopen(url + "missing.collapsed")
+        assert exc.value.code == 404
+    finally:
+        admin.stop()
@@ -0,0 +1,177 @@
+# SPDX-License-Identifier: AGPL-3.0-only
+# SPDX-FileCopyrightText: 2026 Univention GmbH
+
+import pytest
+from udm_rest_api_container import sharedcache
+from udm_rest_api_container.sharedcache import SharedCache
+
+GROUP_DN = "cn=Domain Users,cn=groups,dc=example,dc=com"
+MEMBERS = ["uid=user1,cn=users,dc=example,dc=com", "uid=user2,cn=users,dc=example,dc=com"]
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "cache.sqlite")
+
+
+@pytest.fixture
+def cache(path):
+    return SharedCache(path, 1024 * 1024, 300)
+
+
+class LocalCache:
+
+    def __init__(self):
+        self.entries = {}
+
+    def get(self, key):
+        return self.entries.get(key)
+
+    def set(self, key, value):
+        self.entries[key] = value
+
+    def remove(self, key):
+        self.entries.pop(key, None)
+
+
+class Object:
+
+    def __init__(self, dn):
+        self.dn = dn
+
+    def modify(self):
+        return self.dn
+
+    def move(self, newdn):
+        self.dn = newdn
+        return newdn
+
+    def remove(self):
+        pass
+
+
+def test_get_set(cache):
+    assert cache.get(GROUP_DN) is None
+    cache.set(GROUP_DN, MEMBERS)
+    assert cache.get(GROUP_DN.upper()) == MEMBERS
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_expired(path):
+    cache = SharedCache(path, 1024 * 1024, -1)
+    cache.set(GROUP_DN, MEMBERS)
+    assert cache.get(GROUP_DN) is None
+
+
+def test_shared_between_connections(cache, path):
+    cache.set(GROUP_DN, MEMBERS)
+    assert SharedCache(path, 1024 * 1024, 300).get(GROUP_DN) == MEMBERS
+    SharedCache(path, 1024 * 1024, 300).delete(GROUP_DN)
+    assert cache.get(GROUP_DN) is None
+
+
+def test_evicts_least_recently_used(path):
+    cache = SharedCache(path, 400, 300)
+    for i in range(20):
+        cache.set(f"cn=group{i}", [f"uid=user{i}-{j}" for j in range(5)])
+        cache.get("cn=group0")
+    assert cache.evictions > 0
+    assert cache.get("cn=group0") is not None
+    assert cache.get("cn=group1") is None
+
+
+def test_patch_cache(cache):
+    first, second = LocalCache(), LocalCache()
+    assert sharedcache.patch_cache(cache, first)
+    assert sharedcache.patch_cache(cache, second)
+    first.set(GROUP_DN, MEMBERS)
+    assert second.get(GROUP_DN) == MEMBERS
+    assert second.entries[GROUP_DN] == MEMBERS
+    second.remove(GROUP_DN)
+    assert cache.get(GROUP_DN) is None
+
+
+def test_patch_cache_unknown_interface(cache):
+    assert not sharedcache.patch_cache(cache, object())
+
+
+def test_patch_modifications(cache):
+    sharedcache.patch_modifications(cache, Object)
+    old_dn, new_dn = "cn=old,dc=example,dc=com", "cn=new,dc=example,dc=com"
+    cache.set(old_dn, MEMBERS)
+    cache.set(new_dn, MEMBERS)
+    assert Object(old_dn).move(new_dn) == new_dn
+    assert cache.get(old_dn) is None
+    assert cache.get(new_dn) is None
+    cache.set(GROUP_DN, MEMBERS)
+    Object(GROUP_DN).remove()
+    assert cache.get(GROUP_DN) is None
+
+
+def test_size_is_counted(cache):
+    cache.set(GROUP_DN, MEMBERS)
+    cache.set("cn=other", MEMBERS)
+    cache.set(GROUP_DN, MEMBERS[:1])
+    cache.delete("cn=other")
+    (total,) = cache.db.execute("SELECT SUM(size) FROM cache").fetchone()
+    assert cache.size() == total
+    cache.clear()
+    assert cache.size() == 0
+
+
+def test_touches_are_batched(cache, monkeypatch):
+    monkeypatch.setattr(sharedcache, "TOUCH_BATCH", 2)
+    now = sharedcache.time.time()
+    monkeypatch.setattr(sharedcache.time, "time", lambda: now)
+    cache.set(GROUP_DN, MEMBERS)
+    cache.set("cn=other", MEMBERS)
+    monkeypatch.setattr(sharedcache.time, "time", lambda: now + 1)
+    cache.get(GROUP_DN)
+    assert cache.db.execute("SELECT DISTINCT used FROM cache").fetchall() == [(now,)]
+    cache.get("cn=other")
+    assert cache.db.execute("SELECT DISTINCT used FROM cache").fetchall() == [(now + 1,)]
+
+
+def test_patch_cache_keeps_the_creation_time(cache, monkeypatch):
+    first, second = LocalCache(), LocalCache()
+    sharedcache.patch_cache(cache, first)
+    sharedcache.patch_cache(cache, second)
+    first.set(GROUP_DN, MEMBERS)
+    assert second.get(GROUP_DN) == MEMBERS
+    now = sharedcache.time.time()
+    monkeypatch.setattr(sharedcache.time, "time", lambda: now + 301)
+    assert second.get(GROUP_DN) is None
+    assert second.get(GROUP_DN) is None
+    second.set(GROUP_DN, MEMBERS[:1])
+    assert second.get(GROUP_DN) == MEMBERS[:1]
+
+
+def test_patch_modifications_survives_cache_errors(cache, tmp_path):
+    class Failing(Object):
+        pass
+
+    sharedcache.patch_modifications(cache, Failing)
+    cache.path = str(tmp_path / "missing" / "cache.sqlite")
+    assert Failing(GROUP_DN).modify() == GROUP_DN
+
+
+def test_modification_invalidates_the_in_process_caches(cache, path):
+    # `other` stands for the shared cache of another server process.
+    other = SharedCache(path, 1024 * 1024, 300)
+    first, second = LocalCache(), LocalCache()
+    sharedcache.patch_cache(cache, first)
+    sharedcache.patch_cache(other, second)
+    sharedcache.patch_modifications(cache, Object)
+    first.set(GROUP_DN, ["old"])
+    assert second.get(GROUP_DN) == ["old"]
+    second.set("cn=other", ["other"])
+
+    Object(GROUP_DN).modify()
+    assert cache.get(GROUP_DN) is None
+    assert GROUP_DN not in first.entries
+    assert first.get(GROUP_DN) is None
+    assert second.get(GROUP_DN) is None
+    assert second.get("cn=other") == ["other"]
+
+    second.set(GROUP_DN, ["new"])
+    assert (first.get(GROUP_DN), second.get(GROUP_DN)) == (["new"], ["new"])
@@ -0,0 +1,82 @@
+# SPDX-License-Identifier: AGPL-3.0-only
+# SPDX-FileCopyrightText: 2026 Univention GmbH
+
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from udm_rest_api_container import warmup
+from udm_rest_api_container.admin import AdminServer
+from udm_rest_api_container.metrics import Registry
+
+
+@pytest.fixture
+def server():
+    requests = []
+    unavailable = {"/univention/udm/": 2}
+
+    class Handler(BaseHTTPRequestHandler):
+
+        def do_GET(self):
+            requests.append((self.path, self.headers.get("Authorization")))
+            if unavailable.get(self.path):
+                unavailable[self.path] -= 1
+                self.send_response(503)
+            elif self.path.endswith("/unknown/add"):
+                self.send_response(404)
+            else:
+                self.send_response(200)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+        def log_message(self, format, *args):
+            pass
+
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    httpd.requests = requests
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_parse_modules():
+    assert warmup.parse_modules(" users/user, /groups/group/,,") == ["users/user", "groups/group"]
+    assert warmup.parse_modules("") == []
+
+
+def test_warmup(server):
+    url = f"http://127.0.0.1:{server.server_address[1]}/univention"
+    job = warmup.Warmup(url, ["users/user", "unknown"], "Basic abc", retry_interval=0.01)
+    admin = AdminServer("127.0.0.1", 0)
+    registry = Registry()
+    job.start = lambda: None
+    warmup.install(job, admin, registry)
+    assert admin.dispatch("/ready")[0] == 503
+
+    job.run()
+
+    assert [path for path, _auth in server.requests] == [
+        "/univention/udm/", "/univention/udm/", "/univention/udm/",
+        "/univention/udm/users/user/add", "/univention/udm/unknown/add",
+    ]
+    assert {auth for _path, auth in server.requests} == {"Basic abc"}
+    assert job.failures == 2
+    assert admin.dispatch("/ready")[0] == 200
+    assert "udm_rest_warmup_complete 1" in registry.render()
+
+
+def test_timeout():
+    clock = iter(range(0, 1000, 10))
+    job = warmup.Warmup("http://127.0.0.1:1", ["users/user"], timeout=30, retry_interval=0,
+                        clock=lambda: next(clock))
+    job.run()
+    assert job.ready.is_set()
+    assert job.failures == 3
+    assert job.duration == 40
+
+
+def test_basic_authorization(tmp_path):
+    password_file = tmp_path / "secret"
+    password_file.write_text("univention\n")
+    assert warmup.basic_authorization("cn=admin", str(password_file)) == "Basic Y249YWRtaW46dW5pdmVudGlvbg=="